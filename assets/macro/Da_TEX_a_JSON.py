@@ -16,67 +16,113 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import os
 import re
+import sys
 import json
-from datetime import datetime
+import time
+from itertools import islice
 import threading
-from queue import Queue
+from queue import Queue, Empty
 import shutil
 
+# orjson (se installato) serializza molto piu' velocemente dello stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyperclip (se installato) imposta gli appunti in un'unica chiamata di
+# sistema, e il contenuto sopravvive alla chiusura della finestra Tk
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
 # --------------------------- COSTANTI --------------------------------
 SUPPORTED_EXTS = {'.tex', '.latex', '.json'}
 REQUIRED_JSON_NAME = "glossario.json"
 
+# Pattern per sezioni e sottosezioni (compilati una volta sola)
+SECTION_PATTERN = re.compile(r'\\section\{([A-Z])\}.*?(?=\\section\{|\Z)', re.DOTALL | re.IGNORECASE)
+SUBSECTION_PATTERN = re.compile(r'\\subsection\{([^}]+)\}(.*?)(?=\\subsection\{|\Z)', re.DOTALL)
+
+# Pattern per la pulizia delle definizioni LaTeX (compilati una volta sola).
+# Un'unica alternanza gestisce commenti, comandi di formattazione
+# (\textbf, \textit, \texttt, \emph) e comandi da scartare: una sola
+# passata sul testo invece di sei, piu' la normalizzazione finale degli
+# spazi bianchi.
+_MASTER_RE = re.compile(
+    r'(?P<comment>%[^\n]*)'
+    r'|(?P<fmt>\\(?:textbf|textit|texttt|emph)\{(?P<inner>[^}]+)\})'
+    r'|(?P<drop>\\(?:newpage|pagebreak|clearpage)|\\(?:vspace|hspace)\{[^}]*\}|\\[a-zA-Z]+\{\})'
+)
+_WS_RE = re.compile(r'\s+')
+
+def _clean_dispatch(match):
+    """Sceglie la sostituzione in base al ramo dell'alternanza"""
+    inner = match.group('inner')
+    # Comando di formattazione: mantieni il contenuto; commenti e comandi
+    # da scartare vengono rimossi
+    return inner if inner is not None else ''
+
+# Separatore per i report (calcolato una volta sola)
+_SEP80 = "=" * 80
+
+# Marcatori a inizio riga nel report -> tag colore del widget risultati.
+# Gli emoji fungono da sentinelle di classe: un lookup nel dict
+# sostituisce la vecchia catena di test "sottostringa in riga"
+_REPORT_MARKER_RE = re.compile(r'^[ \t]*([✅🔄➕✏🗑ℹ])', re.MULTILINE)
+_MARKER_TAGS = {
+    '✅': 'success',
+    '➕': 'success',
+    '🔄': 'info',
+    'ℹ': 'info',
+    '✏': 'warning',
+    '🗑': 'danger',
+}
+
 # ------------------------- FUNZIONI UTILI -----------------------------
 
+def _sorted_ci(terms):
+    """Ordina i termini ignorando maiuscole/minuscole.
+
+    Pre-calcola la chiave minuscola una volta per termine (trasformata di
+    Schwartz) cosi' il confronto durante il sort resta interamente in C:
+    sostituisce i vecchi sorted(..., key=str.lower) ripetuti.
+    """
+    decorated = [(term.lower(), term) for term in terms]
+    decorated.sort()
+    return [term for _, term in decorated]
+
 def extract_sections_from_latex(latex_content):
     """Estrae tutte le sezioni dal file LaTeX"""
     sections = {}
-    
-    # Pattern per sezioni e sottosezioni
-    section_pattern = re.compile(r'\\section\{([A-Z])\}.*?(?=\\section\{|\Z)', re.DOTALL | re.IGNORECASE)
-    subsection_pattern = re.compile(r'\\subsection\{([^}]+)\}(.*?)(?=\\subsection\{|\Z)', re.DOTALL)
-    
+
     # Trova tutte le sezioni
-    section_matches = list(section_pattern.finditer(latex_content))
-    
-    for i, section_match in enumerate(section_matches):
-        section_letter = section_match.group(1)
+    for section_match in SECTION_PATTERN.finditer(latex_content):
         section_content = section_match.group(0)
-        
-        # Trova tutte le sottosezioni in questa sezione
-        subsection_matches = subsection_pattern.findall(section_content)
-        
-        for term, definition in subsection_matches:
+
+        # Trova tutte le sottosezioni in questa sezione (finditer evita
+        # di materializzare la lista intermedia di tuple)
+        for subsection_match in SUBSECTION_PATTERN.finditer(section_content):
+            term, definition = subsection_match.groups()
             # Pulisci la definizione
+            term = term.strip()
             definition = clean_latex_definition(definition)
-            if term.strip() and definition.strip():
-                sections[term.strip()] = definition.strip()
+            if term and definition:
+                # intern: confronti e lookup sui termini diventano
+                # confronti di puntatori nei dict
+                sections[sys.intern(term)] = definition
     
     return sections
 
 def clean_latex_definition(text):
     """Pulisce il testo LaTeX rimuovendo comandi e formattazione"""
-    # Rimuovi commenti LaTeX (tutto da % a fine riga)
-    text = re.sub(r'%.*$', '', text, flags=re.MULTILINE)
-    
-    # Rimuovi comandi LaTeX comuni mantenendo il contenuto
-    # Rimuovi \textbf, \textit, \texttt (mantieni il contenuto tra {})
-    text = re.sub(r'\\textbf\{([^}]+)\}', r'\1', text)
-    text = re.sub(r'\\textit\{([^}]+)\}', r'\1', text)
-    text = re.sub(r'\\texttt\{([^}]+)\}', r'\1', text)
-    text = re.sub(r'\\emph\{([^}]+)\}', r'\1', text)
-    
-    # Rimuovi \newpage, \pagebreak, \vspace, \hspace
-    text = re.sub(r'\\newpage|\\pagebreak|\\clearpage|\\vspace\{[^}]*\}|\\hspace\{[^}]*\}', '', text)
-    
-    # Rimuovi comandi di formattazione vuoti
-    text = re.sub(r'\\[a-zA-Z]+\{\}', '', text)
-    
-    # Normalizza spazi bianchi
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-    
-    return text
+    # Prima passata: rimuove commenti e comandi da scartare, mantiene il
+    # contenuto dei comandi di formattazione
+    text = _MASTER_RE.sub(_clean_dispatch, text)
+
+    # Seconda passata: normalizza gli spazi bianchi
+    return _WS_RE.sub(' ', text).strip()
 
 def load_json_glossary(json_path):
     """Carica il glossario JSON esistente"""
@@ -84,16 +130,21 @@ def load_json_glossary(json_path):
         if not os.path.exists(json_path):
             return {}  # File non esistente
         
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
+        # Parsing con orjson se disponibile, altrimenti stdlib
+        if orjson is not None:
+            with open(json_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
         if 'terms' in data and isinstance(data['terms'], list):
-            # Crea dizionario per accesso rapido
-            glossary_dict = {}
-            for item in data['terms']:
-                if 'term' in item and 'definition' in item:
-                    glossary_dict[item['term']] = item['definition']
-            return glossary_dict
+            # Crea dizionario per accesso rapido (comprehension: il ciclo
+            # resta nel fast path C del bytecode; intern sui termini per
+            # velocizzare i confronti con il glossario LaTeX)
+            return {sys.intern(item['term']): item['definition']
+                    for item in data['terms']
+                    if 'term' in item and 'definition' in item}
         else:
             # Prova formato alternativo
             if isinstance(data, dict):
@@ -129,15 +180,23 @@ def save_json_glossary(json_path, terms_dict, progress_callback=None):
     json_path = ensure_correct_json_name(json_path)
     
     # Converti dizionario in lista di oggetti
+    # Al massimo ~20 aggiornamenti di progresso indipendentemente da N,
+    # per non intasare la coda dei messaggi verso la GUI
+    step = max(1, len(terms_dict) // 20)
     terms_list = []
-    
-    for i, (term, definition) in enumerate(sorted(terms_dict.items(), key=lambda x: x[0].lower())):
+
+    # Trasformata di Schwartz: decora con la chiave minuscola e ordina
+    # per confronto di tuple (nessuna lambda Python nel sort)
+    decorated = [(term.lower(), term, definition) for term, definition in terms_dict.items()]
+    decorated.sort()
+
+    for i, (_, term, definition) in enumerate(decorated):
         terms_list.append({
             "term": term,
             "definition": definition
         })
-        
-        if progress_callback and i % 10 == 0:
+
+        if progress_callback and i % step == 0:
             progress = (i / len(terms_dict)) * 100 if terms_dict else 0
             progress_callback(progress)
     
@@ -146,9 +205,13 @@ def save_json_glossary(json_path, terms_dict, progress_callback=None):
         "terms": terms_list
     }
     
-    # Salva file
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Salva file (orjson se disponibile, altrimenti stdlib)
+    if orjson is not None:
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
     
     if progress_callback:
         progress_callback(100)
@@ -157,43 +220,36 @@ def save_json_glossary(json_path, terms_dict, progress_callback=None):
 
 def compare_glossaries(old_dict, new_dict):
     """Confronta due glossari e restituisce differenze"""
-    added = []
-    modified = []
-    removed = []
-    unchanged = []
-    
-    # Termini nuovi o modificati
-    for term, definition in new_dict.items():
-        if term not in old_dict:
-            added.append(term)
-        elif old_dict[term] != definition:
-            modified.append(term)
-        else:
-            unchanged.append(term)
-    
-    # Termini rimossi
-    for term in old_dict:
-        if term not in new_dict:
-            removed.append(term)
-    
+    # Operazioni insiemistiche sulle viste chiavi (eseguite in C)
+    old_keys = old_dict.keys()
+    new_keys = new_dict.keys()
+
+    added = new_keys - old_keys
+    removed = old_keys - new_keys
+    common = new_keys & old_keys
+
+    # Divide l'intersezione in modificati/invariati
+    modified = {term for term in common if old_dict[term] != new_dict[term]}
+    unchanged = common - modified
+
     return {
-        'added': sorted(added, key=str.lower),
-        'modified': sorted(modified, key=str.lower),
-        'removed': sorted(removed, key=str.lower),
-        'unchanged': sorted(unchanged, key=str.lower)
+        'added': _sorted_ci(added),
+        'modified': _sorted_ci(modified),
+        'removed': _sorted_ci(removed),
+        'unchanged': _sorted_ci(unchanged)
     }
 
 def generate_report(latex_path, json_path, diff_result, final_count):
     """Genera report dettagliato della sincronizzazione"""
-    report = []
-    report.append("=" * 80)
-    report.append("REPORT SINCRONIZZAZIONE GLOSSARIO")
-    report.append("=" * 80)
-    report.append(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report.append(f"File LaTeX: {os.path.basename(latex_path)}")
-    report.append(f"File JSON: {os.path.basename(json_path)}")
-    report.append(f"Termini totali: {final_count}")
-    report.append("=" * 80)
+    # Intestazione statica in un'unica f-string (niente append per riga)
+    report = [f"""{_SEP80}
+REPORT SINCRONIZZAZIONE GLOSSARIO
+{_SEP80}
+Data: {time.strftime('%Y-%m-%d %H:%M:%S')}
+File LaTeX: {os.path.basename(latex_path)}
+File JSON: {os.path.basename(json_path)}
+Termini totali: {final_count}
+{_SEP80}"""]
     
     # Statistiche
     report.append("\n📊 STATISTICHE:")
@@ -205,7 +261,7 @@ def generate_report(latex_path, json_path, diff_result, final_count):
     # Dettagli aggiunti
     if diff_result['added']:
         report.append("\n➕ TERMINI AGGIUNTI:")
-        for term in diff_result['added'][:10]:  # Mostra max 10
+        for term in islice(diff_result['added'], 10):  # Mostra max 10
             report.append(f"  • {term}")
         if len(diff_result['added']) > 10:
             report.append(f"  ... e altri {len(diff_result['added']) - 10}")
@@ -213,7 +269,7 @@ def generate_report(latex_path, json_path, diff_result, final_count):
     # Dettagli modificati
     if diff_result['modified']:
         report.append("\n✏️  TERMINI MODIFICATI:")
-        for term in diff_result['modified'][:10]:  # Mostra max 10
+        for term in islice(diff_result['modified'], 10):  # Mostra max 10
             report.append(f"  • {term}")
         if len(diff_result['modified']) > 10:
             report.append(f"  ... e altri {len(diff_result['modified']) - 10}")
@@ -221,18 +277,18 @@ def generate_report(latex_path, json_path, diff_result, final_count):
     # Dettagli rimossi
     if diff_result['removed']:
         report.append("\n🗑️  TERMINI RIMOSSI:")
-        for term in diff_result['removed'][:10]:  # Mostra max 10
+        for term in islice(diff_result['removed'], 10):  # Mostra max 10
             report.append(f"  • {term}")
         if len(diff_result['removed']) > 10:
             report.append(f"  ... e altri {len(diff_result['removed']) - 10}")
     
     # Riepilogo
-    report.append("\n" + "=" * 80)
+    report.append("\n" + _SEP80)
     if not diff_result['added'] and not diff_result['modified'] and not diff_result['removed']:
         report.append("✅ GLOSSARI GIÀ SINCRONIZZATI")
     else:
         report.append("🔄 SINCRONIZZAZIONE COMPLETATA")
-    report.append("=" * 80)
+    report.append(_SEP80)
     
     return "\n".join(report)
 
@@ -250,14 +306,17 @@ class GlossarySyncTool:
         self.status_text = tk.StringVar(value="Pronto")
         self.progress_value = tk.IntVar(value=0)
         
-        # Coda per thread
+        # Copia shadow del contenuto del pannello risultati: evita di
+        # riattraversare il B-tree interno di Tk per copia/esportazione
+        self._results_content = ""
+
+        # Coda per thread: il worker segnala i nuovi messaggi con un
+        # evento virtuale, niente polling periodico a GUI inattiva
         self.message_queue = Queue()
-        
+        self.root.bind('<<QueueUpdate>>', self.check_queue)
+
         # Setup UI
         self.setup_ui()
-        
-        # Check per messaggi
-        self.check_queue()
     
     def setup_ui(self):
         """Configura l'interfaccia utente"""
@@ -479,12 +538,14 @@ class GlossarySyncTool:
         if not latex_dir:
             latex_dir = "."
         
-        # Prima cerca un file JSON esistente
+        # Prima cerca un file JSON esistente (scandir evita stat extra
+        # rispetto a listdir)
         json_files = []
         if os.path.exists(latex_dir):
-            for file in os.listdir(latex_dir):
-                if file.lower().endswith('.json'):
-                    json_files.append(file)
+            with os.scandir(latex_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.lower().endswith('.json'):
+                        json_files.append(entry.name)
         
         if json_files:
             # Se c'è già un glossario.json, usalo
@@ -589,15 +650,16 @@ class GlossarySyncTool:
             try:
                 # Aggiorna progresso
                 def update_progress(value):
-                    self.message_queue.put(('progress', value))
-                
+                    self.post_message('progress', value)
+
                 def update_status(message):
-                    self.message_queue.put(('status', message))
+                    self.post_message('status', message)
                 
-                # 1. Carica LaTeX
+                # 1. Carica LaTeX (lettura binaria + decode in un colpo solo,
+                # evita la traduzione newline del TextIOWrapper)
                 update_status("Caricamento LaTeX...")
-                with open(latex_path, 'r', encoding='utf-8') as f:
-                    latex_content = f.read()
+                with open(latex_path, 'rb') as f:
+                    latex_content = f.read().decode('utf-8')
                 
                 update_progress(20)
                 
@@ -616,10 +678,10 @@ class GlossarySyncTool:
                         json_terms = load_json_glossary(json_input_path)
                     except Exception as e:
                         # Se c'è un errore, avvisa ma continua con dizionario vuoto
-                        self.message_queue.put(('warning', 
+                        self.post_message('warning',
                             f"Attenzione: il file JSON non è stato caricato correttamente.\n"
                             f"Errore: {str(e)}\n\n"
-                            f"Verrà creato un nuovo glossario."))
+                            f"Verrà creato un nuovo glossario.")
                         json_terms = {}
                 
                 update_progress(60)
@@ -629,19 +691,27 @@ class GlossarySyncTool:
                 diff_result = compare_glossaries(json_terms, latex_terms)
                 update_progress(80)
                 
-                # 5. Salva nuovo JSON con nome corretto
-                update_status(f"Salvataggio {REQUIRED_JSON_NAME}...")
-                _, saved_json_path = save_json_glossary(json_final_path, latex_terms, update_progress)
+                # 5. Salva nuovo JSON con nome corretto (salta la scrittura
+                # se i glossari sono già sincronizzati E il file canonico
+                # esiste già: con un JSON di partenza dal nome diverso il
+                # 'glossario.json' promesso va comunque creato)
+                saved_json_path = ensure_correct_json_name(json_final_path)
+                if (not (diff_result['added'] or diff_result['modified'] or diff_result['removed'])
+                        and os.path.exists(saved_json_path)):
+                    update_status("Glossari già sincronizzati, nessuna scrittura...")
+                else:
+                    update_status(f"Salvataggio {REQUIRED_JSON_NAME}...")
+                    _, saved_json_path = save_json_glossary(json_final_path, latex_terms, update_progress)
                 update_progress(90)
                 
                 # 6. Genera report
                 update_status("Generazione report...")
                 report = generate_report(latex_path, saved_json_path, diff_result, len(latex_terms))
                 
-                self.message_queue.put(('complete', (report, diff_result, saved_json_path)))
-                
+                self.post_message('complete', (report, diff_result, saved_json_path))
+
             except Exception as e:
-                self.message_queue.put(('error', str(e)))
+                self.post_message('error', str(e))
         
         # Avvia thread
         thread = threading.Thread(target=sync_task, daemon=True)
@@ -661,9 +731,9 @@ class GlossarySyncTool:
             return
         
         try:
-            # Carica LaTeX
-            with open(latex_path, 'r', encoding='utf-8') as f:
-                latex_content = f.read()
+            # Carica LaTeX (lettura binaria + decode in un colpo solo)
+            with open(latex_path, 'rb') as f:
+                latex_content = f.read().decode('utf-8')
             
             latex_terms = extract_sections_from_latex(latex_content)
             
@@ -686,24 +756,27 @@ class GlossarySyncTool:
                 )
             
             diff_result = compare_glossaries(json_terms, latex_terms)
-            
+
+            # Basename calcolati una volta sola
+            latex_base = os.path.basename(latex_path)
+            json_base = os.path.basename(json_path)
+
             # Determina il nome finale
-            if os.path.basename(json_path).lower() != REQUIRED_JSON_NAME.lower():
+            if json_base.lower() != REQUIRED_JSON_NAME.lower():
                 final_name = REQUIRED_JSON_NAME
             else:
-                final_name = os.path.basename(json_path)
-            
-            # Genera report analisi
-            report = []
-            report.append("=" * 80)
-            report.append("ANALISI DIFFERENZE (SOLO LETTURA)")
-            report.append("=" * 80)
-            report.append(f"File LaTeX: {os.path.basename(latex_path)}")
-            report.append(f"File JSON input: {os.path.basename(json_path)}")
-            report.append(f"File JSON output: {final_name}")
-            report.append(f"Termini LaTeX: {len(latex_terms)}")
-            report.append(f"Termini JSON: {len(json_terms)}")
-            report.append("=" * 80)
+                final_name = json_base
+
+            # Genera report analisi (intestazione in un'unica f-string)
+            report = [f"""{_SEP80}
+ANALISI DIFFERENZE (SOLO LETTURA)
+{_SEP80}
+File LaTeX: {latex_base}
+File JSON input: {json_base}
+File JSON output: {final_name}
+Termini LaTeX: {len(latex_terms)}
+Termini JSON: {len(json_terms)}
+{_SEP80}"""]
             
             report.append("\n📊 DIFFERENZE:")
             report.append(f"  • Da aggiungere: {len(diff_result['added'])}")
@@ -712,82 +785,86 @@ class GlossarySyncTool:
             
             if diff_result['added']:
                 report.append("\n➕ TERMINI NUOVI (non in JSON):")
-                for term in diff_result['added'][:20]:
+                for term in islice(diff_result['added'], 20):
                     report.append(f"  • {term}")
                 if len(diff_result['added']) > 20:
                     report.append(f"  ... e altri {len(diff_result['added']) - 20}")
             
             if diff_result['removed']:
                 report.append("\n🗑️  TERMINI DA RIMUOVERE (non in LaTeX):")
-                for term in diff_result['removed'][:20]:
+                for term in islice(diff_result['removed'], 20):
                     report.append(f"  • {term}")
                 if len(diff_result['removed']) > 20:
                     report.append(f"  ... e altri {len(diff_result['removed']) - 20}")
             
-            report.append("\n" + "=" * 80)
+            report.append("\n" + _SEP80)
             report.append(f"ℹ️  Questa è solo un'analisi. Usa 'SINCRONIZZA' per creare/aggiornare '{REQUIRED_JSON_NAME}'.")
-            report.append("=" * 80)
+            report.append(_SEP80)
             
-            self.results_text.delete("1.0", tk.END)
-            self.results_text.insert("1.0", "\n".join(report))
+            self._set_results("\n".join(report))
             
         except Exception as e:
             messagebox.showerror("Errore Analisi", f"Errore durante l'analisi:\n\n{str(e)}")
     
-    def check_queue(self):
-        """Controlla la coda per messaggi dai thread"""
-        try:
-            while not self.message_queue.empty():
+    def post_message(self, msg_type, data):
+        """Accoda un messaggio dal thread worker e sveglia la GUI"""
+        self.message_queue.put((msg_type, data))
+        # event_generate è thread-safe e fa drenare la coda al main loop
+        self.root.event_generate('<<QueueUpdate>>', when='tail')
+
+    def check_queue(self, event=None):
+        """Drena la coda dei messaggi dai thread"""
+        while True:
+            try:
                 msg_type, data = self.message_queue.get_nowait()
-                
-                if msg_type == 'progress':
-                    self.progress_value.set(data)
-                
-                elif msg_type == 'status':
-                    self.status_text.set(data)
-                
-                elif msg_type == 'warning':
-                    messagebox.showwarning("Avviso", data)
-                
-                elif msg_type == 'complete':
-                    report, diff_result, saved_json_path = data
-                    self.show_results(report, diff_result, saved_json_path)
-                    self.sync_button.config(state=tk.NORMAL)
-                
-                elif msg_type == 'error':
-                    self.status_text.set(f"Errore: {data}")
-                    self.sync_button.config(state=tk.NORMAL)
-                    messagebox.showerror("Errore Sincronizzazione", 
-                                       f"Errore durante la sincronizzazione:\n\n{str(data)}")
-        
-        except:
-            pass
-        
-        # Ricontrolla
-        self.root.after(100, self.check_queue)
-    
+            except Empty:
+                break
+
+            if msg_type == 'progress':
+                self.progress_value.set(data)
+
+            elif msg_type == 'status':
+                self.status_text.set(data)
+
+            elif msg_type == 'warning':
+                messagebox.showwarning("Avviso", data)
+
+            elif msg_type == 'complete':
+                report, diff_result, saved_json_path = data
+                self.show_results(report, diff_result, saved_json_path)
+                self.sync_button.config(state=tk.NORMAL)
+
+            elif msg_type == 'error':
+                self.status_text.set(f"Errore: {data}")
+                self.sync_button.config(state=tk.NORMAL)
+                messagebox.showerror("Errore Sincronizzazione",
+                                   f"Errore durante la sincronizzazione:\n\n{str(data)}")
+    
+    def _set_results(self, content):
+        """Aggiorna il pannello risultati e la copia shadow in memoria"""
+        self._results_content = content
+        self.results_text.delete("1.0", tk.END)
+        self.results_text.insert("1.0", content)
+
     def show_results(self, report, diff_result, saved_json_path):
         """Mostra i risultati della sincronizzazione"""
-        self.results_text.delete("1.0", tk.END)
-        self.results_text.insert("1.0", report)
-        
-        # Evidenzia sezioni
-        lines = report.split('\n')
-        
-        # Applica colori in base al contenuto
-        for i, line in enumerate(lines):
-            start_idx = f"{i+1}.0"
-            
-            if "✅" in line or "GIÀ SINCRONIZZATI" in line:
-                self.results_text.tag_add("success", start_idx, f"{i+1}.end")
-            elif "🔄" in line or "COMPLETATA" in line:
-                self.results_text.tag_add("info", start_idx, f"{i+1}.end")
-            elif "➕" in line or "AGGIUNTI" in line:
-                self.results_text.tag_add("success", start_idx, f"{i+1}.end")
-            elif "✏️" in line or "MODIFICATI" in line:
-                self.results_text.tag_add("warning", start_idx, f"{i+1}.end")
-            elif "🗑️" in line or "RIMOSSI" in line:
-                self.results_text.tag_add("danger", start_idx, f"{i+1}.end")
+        self._set_results(report)
+        
+        # Applica colori in base ai marcatori a inizio riga: una sola
+        # passata sul report e una sola chiamata tag_add per tag
+        # (tag_add accetta piu' coppie di indici in un colpo solo)
+        ranges = {}
+        lineno = 1
+        prev_start = 0
+        for marker_match in _REPORT_MARKER_RE.finditer(report):
+            lineno += report.count('\n', prev_start, marker_match.start())
+            prev_start = marker_match.start()
+            tag = _MARKER_TAGS.get(marker_match.group(1))
+            if tag:
+                ranges.setdefault(tag, []).extend((f"{lineno}.0", f"{lineno}.end"))
+
+        for tag, tag_ranges in ranges.items():
+            self.results_text.tag_add(tag, *tag_ranges)
         
         # Messaggio finale
         added = len(diff_result['added'])
@@ -811,7 +888,7 @@ class GlossarySyncTool:
     
     def export_report(self):
         """Esporta il report"""
-        content = self.results_text.get("1.0", tk.END).strip()
+        content = self._results_content.strip()
         if not content:
             messagebox.showwarning("Nessun report", "Non ci sono risultati da esportare.")
             return
@@ -827,7 +904,9 @@ class GlossarySyncTool:
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
+                # Buffer da 1 MiB: la scrittura del report avviene in
+                # pochi syscall invece che a blocchi da 8 KiB
+                with open(filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
                     f.write(content)
                 
                 messagebox.showinfo(
@@ -839,11 +918,14 @@ class GlossarySyncTool:
     
     def copy_results(self):
         """Copia risultati negli appunti"""
-        content = self.results_text.get("1.0", tk.END).strip()
+        content = self._results_content.strip()
         if content:
-            self.root.clipboard_clear()
-            self.root.clipboard_append(content)
-            
+            if pyperclip is not None:
+                pyperclip.copy(content)
+            else:
+                self.root.clipboard_clear()
+                self.root.clipboard_append(content)
+
             # Feedback temporaneo
             original = self.status_text.get()
             self.status_text.set("✅ Risultati copiati!")
@@ -855,6 +937,7 @@ class GlossarySyncTool:
         self.json_path.set("")
         self.status_text.set("Pronto")
         self.progress_value.set(0)
+        self._results_content = ""
         self.results_text.delete("1.0", tk.END)
         self.sync_button.config(state=tk.NORMAL)
 
@@ -5,14 +5,55 @@ leggendo i termini dal file glossario.json nella cartella SITO.
 Mantiene la struttura LaTeX esistente e ordina i termini alfabeticamente.
 """
 
+import functools
+import hashlib
 import json
+import os
 import re
-from pathlib import Path
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+
+# Escape LaTeX condiviso: la tabella maketrans vive in _latex_escape,
+# costruita una volta all'import, e copre tutti i caratteri speciali
+# (non solo & % $ #)
+import _latex_escape
+
+# Percorsi calcolati una volta a livello di modulo (stringhe semplici,
+# niente oggetti Path intermedi per ogni invocazione)
+_HERE = os.path.abspath(os.path.dirname(__file__))
+_ROOT = os.path.dirname(os.path.dirname(_HERE))
+_GLOSSARIO_JSON = os.path.join(_ROOT, "SITO", "glossario.json")
+_GLOSSARIO_TEX = os.path.join(_ROOT, "RTB", "GLOSSARIO", "Glossario.tex")
+
+# orjson (se installato) decodifica i bytes direttamente, 2-3x piu'
+# veloce dello stdlib su payload ricchi di stringhe come il glossario
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _write_hash_sidecar(hash_path, json_hash):
+    """Registra l'hash del JSON applicato (scrittura atomica)."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(hash_path) or '.')
+    with os.fdopen(fd, 'w', encoding='ascii') as f:
+        f.write(json_hash)
+    os.replace(tmp, hash_path)
+
+@functools.lru_cache(maxsize=None)
+def _escape_latex(text):
+    """Escapa i caratteri speciali LaTeX (memoizzato: le definizioni
+    ripetute tra più termini vengono escapate una volta sola)."""
+    return _latex_escape.escape(text)
 
 def load_glossary_terms(glossary_path):
     """Carica i termini dal file JSON glossario."""
-    with open(glossary_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(glossary_path, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(glossary_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
 
     if 'terms' not in data:
         raise ValueError("Il file JSON non contiene la chiave 'terms'")
@@ -21,48 +62,57 @@ def load_glossary_terms(glossary_path):
 
 def generate_latex_sections(terms):
     """Genera le sezioni LaTeX ordinate alfabeticamente."""
-    # Ordina i termini alfabeticamente (case-insensitive)
-    sorted_terms = sorted(terms, key=lambda x: x['term'].lower())
-
-    sections = {}
-    current_section = None
-
-    # Raggruppa i termini per lettera iniziale
-    for term_data in sorted_terms:
-        term = term_data['term']
-        definition = term_data['definition']
-
-        # Ottieni la lettera iniziale (case-insensitive)
-        first_letter = term[0].upper()
-
-        if first_letter not in sections:
-            sections[first_letter] = []
-
-        sections[first_letter].append((term, definition))
-
-    # Genera il contenuto LaTeX
+    # Ordina i termini alfabeticamente (case-insensitive): decora con la
+    # chiave minuscola calcolata una sola volta per termine e ordina con
+    # itemgetter (callable C, niente lambda nel sort)
+    decorated = [(term_data['term'].lower(), term_data) for term_data in terms]
+    decorated.sort(key=itemgetter(0))
+    sorted_terms = [term_data for _, term_data in decorated]
+
+    # Genera il contenuto LaTeX raggruppando per lettera iniziale:
+    # i termini sono già ordinati, quindi groupby produce i gruppi in
+    # un'unica passata senza il dizionario intermedio e il secondo sort
     latex_content = []
 
-    for letter in sorted(sections.keys()):
+    for letter, group in groupby(sorted_terms, key=lambda t: t['term'][0].upper()):
         latex_content.append(f"\\newpage\n\n\\section{{{letter}}}\n")
 
-        for term, definition in sections[letter]:
-            # Gestisci i caratteri speciali LaTeX nel termine
-            safe_term = term.replace('&', '\\&').replace('%', '\\%').replace('$', '\\$').replace('#', '\\#')
-
-            # Gestisci i caratteri speciali LaTeX nella definizione
-            safe_definition = definition.replace('&', '\\&').replace('%', '\\%').replace('$', '\\$').replace('#', '\\#')
+        for term_data in group:
+            # Gestisci i caratteri speciali LaTeX nel termine e nella
+            # definizione
+            safe_term = _escape_latex(term_data['term'])
+            safe_definition = _escape_latex(term_data['definition'])
 
-            latex_content.append(f"\n\\subsection{{{safe_term}}}")
-            latex_content.append(f"{safe_definition}\n")
+            # Un unico frammento per termine (meno append e allocazioni)
+            latex_content.append(f"\n\\subsection{{{safe_term}}}\n{safe_definition}\n")
 
-    return '\n'.join(latex_content)
+    result = '\n'.join(latex_content)
+    # Libera la memoria della cache di escape dopo la generazione
+    _escape_latex.cache_clear()
+    return result
 
 def update_latex_file(latex_path, glossary_path):
     """Aggiorna il file LaTeX con i nuovi termini dal glossario JSON."""
-    # Leggi il file LaTeX esistente
-    with open(latex_path, 'r', encoding='utf-8') as f:
-        latex_content = f.read()
+    # Hash del JSON: se identico a quello dell'ultima esecuzione il .tex
+    # è già allineato e si salta l'intera riscrittura
+    with open(glossary_path, 'rb') as f:
+        json_bytes = f.read()
+    json_hash = hashlib.blake2b(json_bytes, digest_size=16).hexdigest()
+    hash_path = f"{latex_path}.glossariohash"
+    try:
+        with open(hash_path, 'r', encoding='ascii') as f:
+            if f.read().strip() == json_hash:
+                print("✅ File LaTeX già aggiornato (glossario JSON invariato)")
+                return
+    except OSError:
+        pass  # nessun hash precedente: procedi con l'aggiornamento
+
+    # Leggi il file LaTeX esistente come bytes: i marcatori sono ASCII,
+    # quindi la ricerca avviene sui bytes e si decodificano solo la testa
+    # e la coda mantenute (la parte centrale viene scartata senza mai
+    # pagare la decodifica UTF-8)
+    with open(latex_path, 'rb') as f:
+        raw = f.read()
 
     # Carica i termini dal glossario
     terms = load_glossary_terms(glossary_path)
@@ -71,56 +121,81 @@ def update_latex_file(latex_path, glossary_path):
     new_sections = generate_latex_sections(terms)
 
     # Trova la parte da sostituire: da dopo "\section{Introduzione}" fino a prima di "\end{document}"
-    # Cerchiamo il pattern che identifica l'inizio delle sezioni dei termini
-    intro_pattern = r'(\\section\{Introduzione\}.*?\\newpage\s*\\section\{[A-Z]\})'
-    end_pattern = r'(\\end\{document\})'
+    # Tre scansioni find lineari al posto della vecchia regex con
+    # ".*?" + DOTALL, che su file grandi degenerava in backtracking
+    intro_idx = raw.find(b'\\section{Introduzione}')
+    if intro_idx == -1:
+        raise ValueError("Non riesco a trovare la sezione Introduzione nel file LaTeX")
 
-    # Troviamo dove inizia la sezione Introduzione
-    intro_match = re.search(intro_pattern, latex_content, re.DOTALL)
-    if not intro_match:
+    # La prima \section{X} di una lettera dopo il \newpage che chiude
+    # l'introduzione
+    newpage_idx = raw.find(b'\\newpage', intro_idx)
+    letter_idx = raw.find(b'\\section{', newpage_idx) if newpage_idx != -1 else -1
+    if letter_idx != -1:
+        # Il titolo deve essere una singola lettera maiuscola: lo splice
+        # più sotto taglia a intro_end = letter_idx + len(b'\section{X}'),
+        # quindi con un'intestazione qualsiasi (es. \section{Termini})
+        # lascerebbe un titolo mozzato e un .tex corrotto. La vecchia
+        # regex richiedeva \section{[A-Z]}: con altro, fallisci come lei
+        header = raw[letter_idx + len(b'\\section{'):letter_idx + len(b'\\section{X}')]
+        if not (len(header) == 2 and 65 <= header[0] <= 90 and header[1] == ord('}')):
+            letter_idx = -1
+    if letter_idx == -1:
         raise ValueError("Non riesco a trovare la sezione Introduzione nel file LaTeX")
 
     # Troviamo dove finisce il documento
-    end_match = re.search(end_pattern, latex_content)
-    if not end_match:
+    end_start = raw.rfind(b'\\end{document}')
+    if end_start == -1:
         raise ValueError("Non riesco a trovare \\end{document} nel file LaTeX")
 
-    # Estrai la parte iniziale (fino alla fine dell'introduzione)
-    intro_end = intro_match.end(1)
-    start_content = latex_content[:intro_end]
+    # Estrai la parte iniziale (fino alla fine dell'introduzione,
+    # inclusa la prima \section{X})
+    intro_end = letter_idx + len(b'\\section{X}')
 
-    # La parte finale inizia da \end{document}
-    end_start = end_match.start(1)
-    end_content = latex_content[end_start:]
+    # Se le sezioni rigenerate coincidono con quelle già presenti, salta
+    # l'intera riscrittura (confronto sui bytes, senza decodifica)
+    if raw[intro_end:end_start].strip() == new_sections.encode('utf-8').strip():
+        _write_hash_sidecar(hash_path, json_hash)
+        print("✅ File LaTeX già aggiornato (sezioni invariate)")
+        return
 
-    # Combina tutto
-    updated_content = start_content + '\n' + new_sections + '\n\n' + end_content
+    start_content = raw[:intro_end].decode('utf-8')
 
-    # Scrivi il file aggiornato
-    with open(latex_path, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
+    # La parte finale inizia da \end{document}
+    end_content = raw[end_start:].decode('utf-8')
+
+    # Scrivi il file aggiornato: writelines sui frammenti evita la
+    # concatenazione in un'unica megastringa (dimezza il picco di memoria).
+    # Scrittura su file temporaneo + os.replace atomico: un crash a metà
+    # scrittura non lascia mai un .tex troncato
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(latex_path) or '.',
+                               suffix='.tex.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines((start_content, '\n', new_sections, '\n\n', end_content))
+        os.replace(tmp, latex_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    # Registra l'hash del JSON appena applicato
+    _write_hash_sidecar(hash_path, json_hash)
 
     print(f"✅ File LaTeX aggiornato con {len(terms)} termini")
     print(f"📁 File salvato: {latex_path}")
 
-def main():
-    # Percorsi
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent.parent
-    glossario_json = project_root / "SITO" / "glossario.json"
-    glossario_tex = project_root / "RTB" / "GLOSSARIO" / "Glossario.tex"
-
+def main(glossario_json=_GLOSSARIO_JSON, glossario_tex=_GLOSSARIO_TEX):
     print("🔄 Script per aggiornare Glossario.tex dal file JSON")
     print(f"📖 Glossario JSON: {glossario_json}")
     print(f"📝 File LaTeX: {glossario_tex}")
     print()
 
     # Verifica che i file esistano
-    if not glossario_json.exists():
+    if not os.path.exists(glossario_json):
         print(f"❌ Errore: file glossario JSON non trovato: {glossario_json}")
         return 1
 
-    if not glossario_tex.exists():
+    if not os.path.exists(glossario_tex):
         print(f"❌ Errore: file LaTeX non trovato: {glossario_tex}")
         return 1
 
@@ -1,14 +1,22 @@
 import json
+from operator import itemgetter
 
 # Carica il file JSON
 with open('glossario.json', 'r', encoding='utf-8') as file:
     data = json.load(file)
 
-# Ordina i termini in modo case-insensitive (ignora maiuscole/minuscole)
-data['terms'] = sorted(data['terms'], key=lambda x: x['term'].lower())
+# Ordina i termini in modo case-insensitive (ignora maiuscole/minuscole):
+# la chiave minuscola è calcolata una volta per termine e il sort usa
+# itemgetter (callable C) invece di una lambda
+decorated = [(item['term'].lower(), item) for item in data['terms']]
+decorated.sort(key=itemgetter(0))
+data['terms'] = [item for _, item in decorated]
 
-# Salva il file JSON ordinato
-with open('glossario_ordinato.json', 'w', encoding='utf-8') as file:
-    json.dump(data, file, ensure_ascii=False, indent=2)
+# Salva il file JSON ordinato: serializza in un'unica stringa e scrive
+# il blob in un colpo solo (json.dump sul file emette tante piccole
+# write, una per separatore/indentazione)
+buf = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+with open('glossario_ordinato.json', 'wb', buffering=1 << 20) as file:
+    file.write(buf)
 
 print("Glossario ordinato e salvato come 'glossario_ordinato.json'")
\ No newline at end of file
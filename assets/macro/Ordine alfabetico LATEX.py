@@ -1,15 +1,18 @@
 import re
+from collections import Counter
+
+# Pattern compilati una volta sola a livello di modulo
+_SECTION_RE = re.compile(r'(\\section\{([A-Z])\}.*?)(?=\\section\{|\Z)', re.DOTALL)
+_SUBSECTION_RE = re.compile(r'(\\subsection\{.*?\}.*?)(?=\\subsection\{|$)', re.DOTALL)
+_SUBNAME_RE = re.compile(r'\\subsection\{(.*?)\}')
 
 def sort_glossary(file_path):
     # Leggi il file
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Pattern per catturare una sezione completa (lettera)
-    section_pattern = re.compile(r'(\\section\{([A-Z])\}.*?)(?=\\section\{|\Z)', re.DOTALL)
-    
     # Trova tutte le sezioni
-    sections = section_pattern.findall(content)
+    sections = _SECTION_RE.findall(content)
     
     if not sections:
         print("Nessuna sezione trovata")
@@ -22,18 +25,15 @@ def sort_glossary(file_path):
     sorted_sections_content = []
     
     for section_content, section_letter in sections_sorted:
-        # Pattern per catturare le sottosezioni all'interno di una sezione
-        subsection_pattern = re.compile(r'(\\subsection\{.*?\}.*?)(?=\\subsection\{|$)', re.DOTALL)
-        
         # Trova tutte le sottosezioni
-        subsections = subsection_pattern.findall(section_content)
+        subsections = _SUBSECTION_RE.findall(section_content)
         
         if subsections:
             # Estrai i nomi delle sottosezioni per l'ordinamento
             subsection_names = []
             for sub in subsections:
                 # Estrai il nome dalla sottosezione
-                name_match = re.search(r'\\subsection\{(.*?)\}', sub)
+                name_match = _SUBNAME_RE.search(sub)
                 if name_match:
                     subsection_names.append((name_match.group(1), sub))
             
@@ -74,25 +74,16 @@ def main():
         
         print(f"Glossario ordinato salvato in: {output_file}")
         
-        # Controlla se ci sono duplicati
-        with open(output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Cerca duplicati nelle sottosezioni
-        subsection_pattern = re.compile(r'\\subsection\{(.*?)\}', re.DOTALL)
-        all_subsections = subsection_pattern.findall(content)
-        
-        duplicates = {}
-        for subsection in all_subsections:
-            duplicates[subsection] = duplicates.get(subsubsection, 0) + 1
-        
-        dup_found = False
+        # Controlla se ci sono duplicati nelle sottosezioni, riusando il
+        # contenuto già in memoria (niente rilettura del file)
+        all_subsections = _SUBNAME_RE.findall(sorted_content)
+        duplicates = {name: count for name, count in Counter(all_subsections).items()
+                      if count > 1}
+
         for subsection, count in duplicates.items():
-            if count > 1:
-                print(f"Attenzione: '{subsection}' appare {count} volte")
-                dup_found = True
-        
-        if not dup_found:
+            print(f"Attenzione: '{subsection}' appare {count} volte")
+
+        if not duplicates:
             print("Nessun duplicato trovato.")
             
     except FileNotFoundError:
@@ -16,15 +16,71 @@ MIGLIORAMENTI:
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
+import functools
 import os
 import re
 import json
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from queue import Queue, Empty
 from pathlib import Path
 
+# pyahocorasick (se installato) permette di cercare tutti i termini del
+# glossario in un'unica passata sul testo invece di una scansione regex
+# per termine; senza la libreria si usa il percorso classico
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # --------------------------- COSTANTI --------------------------------
 TAG_G_FULL = r"\textsubscript{\scalebox{0.6}{\textbf{G}}}"
 TAG_G_SHORT = r"\G"
 
+# Tutti i pattern letterali sono compilati una volta all'import: la
+# cache interna di re è limitata a 512 voci e con i pattern per-variante
+# generati a runtime andrebbe regolarmente svuotata
+
+# Termini del glossario nelle \subsection del .tex
+_SUBSECTION_RE = re.compile(r'\\subsection\{([^}]+)\}')
+
+# Comandi LaTeX residui da ripulire nei termini estratti
+_TEX_CLEAN_RE = re.compile(r'\\[a-zA-Z]+\{([^}]*)\}')
+
+# Riconoscimento acronimi: "POC (Proof of Concept)" e forma nuda "POC"
+# Un solo pattern per entrambe le forme col contenuto tra parentesi:
+# il primo gruppo cattura gli acronimi ("POC (Proof of Concept)"), il
+# secondo tutto il resto ("Affidabilità (Reliability)"), il terzo la
+# parte tra parentesi — un re.match invece di due
+_PAREN_SPLIT_RE = re.compile(r'^(?:([A-Z]{2,})|(.+?))\s*\(([^)]+)\)$')
+_BARE_ACRONYM_RE = re.compile(r'^[A-Z]{2,}$')
+
+# Comandi LaTeX con path come argomento: le occorrenze al loro interno
+# vanno escluse dall'analisi. Un'unica alternazione per categoria: una
+# sola scansione del documento invece di una per pattern
+_LATEX_PATH_RE = re.compile(
+    r'\\(?:includegraphics(?:\[[^\]]*\])?\{[^}]+\}'
+    r'|input\{[^}]+\}'
+    r'|include\{[^}]+\}'
+    r'|graphicspath\{\{[^}]+\}\}'
+    r'|bibliographystyle\{[^}]+\}'
+    r'|bibliography\{[^}]+\})')
+
+# URL veri (con protocollo o www.). re.ASCII: la sintassi è ASCII pura,
+# le classi \s/\w saltano le tabelle Unicode
+_URL_RE = re.compile(
+    r'(?:https?://|ftp://|www\.)[^\s\}]+', re.ASCII)
+
+# Percorsi assoluti di filesystem (non relativi)
+_ABS_PATH_RE = re.compile(
+    r'(?:[A-Za-z]:\\[^\s\}]+'                      # Windows assoluto: C:\Users\...
+    r'|/(?:home|var|usr|opt|etc|tmp)/[^\s\}]+)',   # Unix assoluto comune
+    re.ASCII)
+
 # ------------------------- FUNZIONI PARSING GLOSSARIO -----------------
 
 def extract_terms_from_tex(tex_path, progress_callback=None):
@@ -35,47 +91,44 @@ def extract_terms_from_tex(tex_path, progress_callback=None):
     if progress_callback:
         progress_callback(0, "Lettura file .tex...")
     
+    # Lettura binaria unica + decodifica in memoria: il fallback latin-1
+    # non rilegge il file da disco
     try:
-        with open(tex_path, "r", encoding="utf-8") as f:
-            content = f.read()
-    except Exception:
-        try:
-            with open(tex_path, "r", encoding="latin-1") as f:
-                content = f.read()
-        except Exception as e:
-            raise Exception(f"Errore lettura glossario.tex: {e}")
+        with open(tex_path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        raise Exception(f"Errore lettura glossario.tex: {e}")
+
+    try:
+        content = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        content = raw.decode("latin-1")
     
     if progress_callback:
         progress_callback(30, "Estrazione termini...")
     
-    # Pattern per estrarre i termini dalle subsection
-    pattern = r'\\subsection\{([^}]+)\}'
-    matches = re.findall(pattern, content)
+    # Estrai i termini dalle subsection
+    matches = _SUBSECTION_RE.findall(content)
     
     if progress_callback:
         progress_callback(70, "Pulizia e rimozione duplicati...")
     
-    # Rimuovi duplicati e pulisci
-    terms = []
-    seen = set()
-    for i, term in enumerate(matches):
-        if progress_callback and i % 10 == 0:
-            progress = 70 + (i / len(matches)) * 25
-            progress_callback(progress, f"Elaborazione termine {i+1}/{len(matches)}...")
-        
-        # Pulisci il termine da eventuali comandi LaTeX residui
-        clean_term = re.sub(r'\\[a-zA-Z]+\{([^}]*)\}', r'\1', term)
-        clean_term = clean_term.strip()
-        
-        # Evita duplicati (case-insensitive)
-        if clean_term.lower() not in seen:
-            terms.append(clean_term)
-            seen.add(clean_term.lower())
-    
+    # Pulisci i termini da eventuali comandi LaTeX residui e rimuovi i
+    # duplicati (case-insensitive) con un dict: una voce per chiave
+    # minuscola, e iterando al contrario vince la prima occorrenza
+    # (stessa semantica del vecchio set + append, meno lavoro per termine)
+    # sys.intern sulla chiave minuscola: le forme brevi ricorrenti
+    # (acronimi) si confrontano per identità di puntatore nel probe
+    cleaned = [_TEX_CLEAN_RE.sub(r'\1', term).strip()
+               for term in matches]
+    terms = list({sys.intern(term.lower()): term
+                  for term in reversed(cleaned)}.values())
+    terms.sort()
+
     if progress_callback:
         progress_callback(100, "Completato!")
-    
-    return sorted(terms)
+
+    return terms
 
 def extract_terms_from_json(json_path, progress_callback=None):
     """
@@ -92,45 +145,99 @@ def extract_terms_from_json(json_path, progress_callback=None):
             progress_callback(40, "Estrazione termini...")
         
         terms = []
-        seen = set()
-        
+
         if "terms" in data and isinstance(data["terms"], list):
-            total = len(data["terms"])
-            for i, item in enumerate(data["terms"]):
-                if progress_callback and i % 5 == 0:
-                    progress = 40 + (i / total) * 50
-                    progress_callback(progress, f"Elaborazione termine {i+1}/{total}...")
-                
-                if "term" in item:
-                    term = item["term"].strip()
-                    # Evita duplicati (case-insensitive)
-                    if term.lower() not in seen:
-                        terms.append(term)
-                        seen.add(term.lower())
-        
+            # Dedup case-insensitive con dict come nel percorso .tex:
+            # l'iterazione al contrario fa vincere la prima occorrenza
+            stripped = [item["term"].strip() for item in data["terms"]
+                        if "term" in item]
+            terms = list({sys.intern(term.lower()): term
+                          for term in reversed(stripped)}.values())
+
+        terms.sort()
+
         if progress_callback:
             progress_callback(100, "Completato!")
-        
-        return sorted(terms)
+
+        return terms
     except Exception as e:
         raise Exception(f"Errore lettura glossario.json: {e}")
 
+# Cache su disco dei termini estratti, condivisa tra esecuzioni della
+# GUI: chiave (mtime_ns, size) per file, formato JSON (niente pickle:
+# leggibile e senza esecuzione di codice al caricamento)
+_DISK_CACHE_PATH = os.path.join(tempfile.gettempdir(),
+                                'scanner_glossario_cache.json')
+
+def _read_disk_cache(glossary_path, mtime_ns, size):
+    """Termini dell'ultima estrazione se il glossario non è cambiato."""
+    try:
+        with open(_DISK_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        entry = cache.get(os.path.abspath(glossary_path))
+        if entry and entry[0] == mtime_ns and entry[1] == size:
+            return entry[2]
+    except (OSError, ValueError):
+        pass  # cache assente o corrotta: si riparte dal parsing
+    return None
+
+def _write_disk_cache(glossary_path, mtime_ns, size, terms):
+    """Registra i termini estratti; un fallimento non blocca l'analisi."""
+    try:
+        try:
+            with open(_DISK_CACHE_PATH, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        cache[os.path.abspath(glossary_path)] = [mtime_ns, size, list(terms)]
+        with open(_DISK_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+@functools.lru_cache(maxsize=8)
+def _extract_terms_cached(glossary_path, mtime_ns, size):
+    """
+    Estrazione memoizzata dei termini. mtime_ns e size non servono nel
+    corpo del parsing: fanno parte della chiave di cache, così
+    ricaricare lo stesso glossario non rilegge né riordina nulla finché
+    il file non cambia. Oltre alla lru_cache di sessione c'è una cache
+    su disco: riaprire la GUI con lo stesso glossario salta del tutto il
+    parsing.
+    """
+    cached = _read_disk_cache(glossary_path, mtime_ns, size)
+    if cached is not None:
+        return tuple(cached)
+
+    if glossary_path.endswith('.json'):
+        terms = tuple(extract_terms_from_json(glossary_path))
+    else:
+        terms = tuple(extract_terms_from_tex(glossary_path))
+    _write_disk_cache(glossary_path, mtime_ns, size, terms)
+    return terms
+
 def load_glossary_terms(glossary_path, progress_callback=None):
     """
     Carica i termini dal glossario (auto-rileva formato .tex o .json)
     """
     if glossary_path is None:
         return None, "Nessun file glossario selezionato"
-    
+
     if not os.path.exists(glossary_path):
         return None, f"File non trovato: {glossary_path}"
-    
+
     try:
-        if glossary_path.endswith('.tex') or glossary_path.endswith('.latex'):
-            terms = extract_terms_from_tex(glossary_path, progress_callback)
-            return terms, None
-        elif glossary_path.endswith('.json'):
-            terms = extract_terms_from_json(glossary_path, progress_callback)
+        if glossary_path.endswith(('.tex', '.latex', '.json')):
+            stat = os.stat(glossary_path)
+            if progress_callback:
+                progress_callback(0, "Caricamento termini...")
+            # sys.intern: i termini vengono usati come chiavi di dict in
+            # analyze_text, e le stringhe internate si confrontano per
+            # identità nel fast-path dell'hash lookup
+            terms = [sys.intern(t) for t in _extract_terms_cached(
+                glossary_path, stat.st_mtime_ns, stat.st_size)]
+            if progress_callback:
+                progress_callback(100, "Completato!")
             return terms, None
         else:
             return None, "Formato file non supportato (usa .tex, .latex o .json)"
@@ -139,6 +246,7 @@ def load_glossary_terms(glossary_path, progress_callback=None):
 
 # ------------------------- FUNZIONI ANALISI MIGLIORATE -----------------------------
 
+@functools.lru_cache(maxsize=4096)
 def generate_term_variants(term):
     """
     Genera tutte le varianti possibili di un termine per la ricerca.
@@ -146,115 +254,285 @@ def generate_term_variants(term):
     - Acronimi con descrizione: "POC (Proof of Concept)" -> ["POC", "Proof of Concept"]
     - Termini con traduzioni: "Affidabilità (Reliability)" -> ["Affidabilità", "Reliability"]
     - Termini con caratteri speciali
+
+    Ritorna una tupla senza duplicati, in ordine deterministico.
     """
-    variants = set()
-    
-    # Aggiungi sempre il termine originale
-    variants.add(term)
-    
-    # Pattern per acronimi con descrizione: "ACRONIMO (Descrizione Completa)"
-    # Es: "POC (Proof of Concept)", "AI (Artificial Intelligence)"
-    acronym_pattern = r'^([A-Z]{2,})\s*\(([^)]+)\)$'
-    match = re.match(acronym_pattern, term)
-    
-    if match:
-        acronym = match.group(1).strip()  # Es: "POC"
-        full_form = match.group(2).strip()  # Es: "Proof of Concept"
-        
-        variants.add(acronym)
-        variants.add(full_form)
-        
-        # Aggiungi anche varianti con trattini se presenti nella forma estesa
-        if '-' in full_form:
-            variants.add(full_form.replace('-', ' '))
-        
-        return variants
-    
-    # Pattern per termini con descrizione/traduzione tra parentesi
-    # Es: "Affidabilità (Reliability)", "Verifica (Verification)"
-    paren_pattern = r'^(.+?)\s*\(([^)]+)\)$'
-    match = re.match(paren_pattern, term)
-    
+    # La stragrande maggioranza dei termini non ha parentesi: per quelli
+    # si ritorna subito, senza pagare i due re.match né la costruzione
+    # di una collezione intermedia
+    if '(' not in term:
+        return (term,)
+
+    variants = [term]
+
+    # Un unico re.match distingue le due forme:
+    # - acronimo con descrizione ("POC (Proof of Concept)"): gruppo 1
+    # - termine con traduzione ("Affidabilità (Reliability)"): gruppo 2
+    match = _PAREN_SPLIT_RE.match(term)
+
     if match:
-        main_term = match.group(1).strip()  # Es: "Affidabilità"
-        alt_term = match.group(2).strip()   # Es: "Reliability"
-        
-        variants.add(main_term)
-        variants.add(alt_term)
-        
-        # Se il termine alternativo ha trattini, aggiungi versione con spazi
+        acronym, main_term, paren_part = match.groups()
+
+        variants.append((acronym or main_term).strip())
+        alt_term = paren_part.strip()  # Es: "Proof of Concept"
+        variants.append(alt_term)
+
+        # Se la parte tra parentesi ha trattini, aggiungi versione con spazi
         if '-' in alt_term:
-            variants.add(alt_term.replace('-', ' '))
-    
-    return variants
+            variants.append(alt_term.replace('-', ' '))
+
+    return tuple(dict.fromkeys(variants))
+
+# Dimensione dei blocchi di alternazione del prefiltro regex: blocchi
+# piccoli si compilano in fretta e non saturano la cache interna di re
+_PREFILTER_CHUNK = 25
+
+@functools.lru_cache(maxsize=4)
+def _term_search_index(terms):
+    """
+    Costruisce l'indice di ricerca sulle varianti (minuscole) di tutti i
+    termini: l'automa Aho-Corasick se pyahocorasick è installato, o in
+    alternativa alternazioni regex compilate a blocchi di ~25 varianti.
+    Ritorna (automa, pattern, varianti->termini, termini_sempre_scansionati):
+    le varianti con trattino matchano anche con spazi al posto dei
+    trattini, quindi non sono emulabili con una ricerca letterale e i
+    loro termini vengono sempre passati alla scansione regex completa.
+    """
+    words = {}
+    always_scan = set()
+    for term in terms:
+        for variant in generate_term_variants(term):
+            if '-' in variant:
+                always_scan.add(term)
+            else:
+                words.setdefault(variant.lower(), []).append(term)
+
+    automaton = None
+    patterns = []
+    if words and ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for word, owners in words.items():
+            automaton.add_word(word, tuple(owners))
+        automaton.make_automaton()
+    elif words:
+        # Fallback stdlib: alternazioni compilate una volta sola (la
+        # cache interna di re è limitata a 512 pattern e con glossari
+        # grandi andrebbe in thrashing). La variante matchata è catturata
+        # in un lookahead a larghezza zero, così le occorrenze contenute
+        # in una variante più lunga dello stesso blocco non vengono
+        # consumate e restano individuabili.
+        variants = sorted(words, key=len, reverse=True)
+
+        # A parità di inizio l'alternazione preferisce la variante più
+        # lunga: una variante che compare SOLO come prefisso di una più
+        # lunga dello stesso blocco (es. "verbale" solo dentro "verbale
+        # interno") non verrebbe mai catturata e il suo termine finirebbe
+        # tra i "non presenti". Ogni variante accredita quindi anche i
+        # termini dei propri prefissi che nella variante stessa terminano
+        # su un carattere non alfabetico: quel carattere è parte della
+        # variante lunga, quindi la chiusura si calcola una volta qui e
+        # non dipende dal documento.
+        credited = {}
+        for word in variants:
+            owners = list(words[word])
+            for j in range(1, len(word)):
+                ch = word[j]
+                if 'a' <= ch <= 'z' or 'A' <= ch <= 'Z':
+                    continue
+                prefix_owners = words.get(word[:j])
+                if prefix_owners:
+                    owners.extend(prefix_owners)
+            credited[word] = tuple(dict.fromkeys(owners))
+        words = credited
+
+        for i in range(0, len(variants), _PREFILTER_CHUNK):
+            chunk = variants[i:i + _PREFILTER_CHUNK]
+            alternation = '|'.join(map(re.escape, chunk))
+            patterns.append(re.compile(
+                r'(?<![A-Za-z])(?=(' + alternation + r')(?![A-Za-z]))'))
 
-def is_inside_url_or_path(text, start, end):
+    return automaton, tuple(patterns), words, frozenset(always_scan)
+
+def _find_candidate_terms(text, terms, text_lower=None):
+    """
+    Prefiltro: una sola passata sul testo (minuscolo) per individuare
+    quali termini del glossario potrebbero comparire. I candidati vengono
+    comunque verificati dalla scansione regex completa (word boundary,
+    case degli acronimi, URL/percorsi), quindi i falsi positivi del
+    prefiltro non producono falsi risultati.
     """
-    Verifica se una posizione nel testo deve essere ESCLUSA dall'analisi.
-    Ritorna True se il termine è dentro:
+    automaton, patterns, words, always_scan = _term_search_index(terms)
+    candidates = set(always_scan)
+
+    if text_lower is None:
+        text_lower = text.lower()
+
+    if automaton is not None:
+        for _end, owners in automaton.iter(text_lower):
+            candidates.update(owners)
+    else:
+        for pattern in patterns:
+            for match in pattern.finditer(text_lower):
+                candidates.update(words[match.group(1)])
+
+    return candidates
+
+def build_exclusion_intervals(text):
+    """
+    Indicizza una volta per documento le zone da ESCLUDERE dall'analisi:
     - Comandi LaTeX con path (\includegraphics, \input, ecc.)
     - URL reali
     - Percorsi assoluti di filesystem
+    Ritorna una lista ordinata di intervalli (start, end) fusi: il
+    controllo per match diventa una ricerca binaria invece di rilanciare
+    tutti i pattern su una finestra di contesto a ogni occorrenza.
     """
-    # Espandi il contesto intorno alla posizione trovata
-    context_start = max(0, start - 150)
-    context_end = min(len(text), end + 50)
-    context = text[context_start:context_end]
-    
-    # Posizione relativa nel contesto
-    rel_start = start - context_start
-    rel_end = end - context_start
-    
-    # Controlla se siamo dentro un comando LaTeX con argomento tra graffe
-    # Pattern: \comando{...contenuto...}
-    latex_commands_with_paths = [
-        r'\\includegraphics(?:\[[^\]]*\])?\{[^}]+\}',
-        r'\\input\{[^}]+\}',
-        r'\\include\{[^}]+\}',
-        r'\\graphicspath\{\{[^}]+\}\}',
-        r'\\bibliographystyle\{[^}]+\}',
-        r'\\bibliography\{[^}]+\}',
-    ]
-    
-    for pattern in latex_commands_with_paths:
-        for match in re.finditer(pattern, context):
-            match_start, match_end = match.span()
-            # Se siamo dentro questo comando LaTeX, ESCLUDI
-            if match_start <= rel_start < match_end or match_start < rel_end <= match_end:
-                return True  # ESCLUDI, è dentro un comando LaTeX
-    
-    # Controlla URL VERI (devono essere completi con protocollo o www)
-    url_patterns = [
-        r'https?://[^\s\}]+',     # http:// o https://
-        r'www\.[^\s\}]+',          # www.
-        r'ftp://[^\s\}]+',         # ftp://
-    ]
-    
-    for pattern in url_patterns:
-        for match in re.finditer(pattern, context):
-            match_start, match_end = match.span()
-            if match_start <= rel_start < match_end or match_start < rel_end <= match_end:
-                return True  # È dentro un URL vero, ESCLUDI
-    
-    # Controlla percorsi ASSOLUTI di filesystem (non relativi)
-    # Solo percorsi che iniziano con C:\ o /home/ o /var/ ecc.
-    absolute_path_patterns = [
-        r'[A-Za-z]:\\[^\s\}]+',                    # Windows assoluto: C:\Users\...
-        r'/(?:home|var|usr|opt|etc|tmp)/[^\s\}]+', # Unix assoluto comune
-    ]
-    
-    for pattern in absolute_path_patterns:
-        for match in re.finditer(pattern, context):
-            match_start, match_end = match.span()
-            if match_start <= rel_start < match_end or match_start < rel_end <= match_end:
-                return True  # È dentro un path assoluto vero, ESCLUDI
-    
-    return False  # Non è in nessun contesto da escludere, INCLUDI nell'analisi
+    spans = []
+    for pattern in (_LATEX_PATH_RE, _URL_RE, _ABS_PATH_RE):
+        for match in pattern.finditer(text):
+            spans.append(match.span())
+    spans.sort()
+
+    # Fondi gli intervalli sovrapposti o adiacenti
+    merged = []
+    for span_start, span_end in spans:
+        if merged and span_start <= merged[-1][1]:
+            if span_end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], span_end)
+        else:
+            merged.append((span_start, span_end))
+    return merged
 
-def find_occurrences_with_tag(text, term):
+def is_inside_url_or_path(exclusion_intervals, start, end):
+    """
+    Verifica se una posizione nel testo deve essere ESCLUSA dall'analisi:
+    il match è escluso se il suo inizio o la sua fine cadono dentro uno
+    degli intervalli di build_exclusion_intervals (due bisect, O(log n)).
+    """
+    i = bisect_right(exclusion_intervals, (start, sys.maxsize)) - 1
+    if i >= 0 and start < exclusion_intervals[i][1]:
+        return True
+    j = bisect_right(exclusion_intervals, (end - 1, sys.maxsize)) - 1
+    return j >= 0 and exclusion_intervals[j][0] < end <= exclusion_intervals[j][1]
+
+@functools.lru_cache(maxsize=None)
+def _compiled_variants(term):
+    """
+    Compila una volta per termine i pattern regex delle sue varianti e
+    li memoizza: analizzando una cartella, ogni file riusa i pattern già
+    compilati invece di ripagare re.escape e la generazione varianti.
+    Ritorna tuple (pattern, usa_testo_minuscolo, variante, letterale):
+    letterale è la sottostringa la cui presenza è condizione necessaria
+    per un match (None per le varianti col trattino, che matchano anche
+    con spazi e non hanno un letterale unico).
+    """
+    compiled = []
+    for variant in generate_term_variants(term):
+        # 1. Acronimi (solo lettere maiuscole, 2+ caratteri): lookaround
+        #    per evitare match parziali ("POC" non deve matchare "EPOCH"),
+        #    case-sensitive sul testo originale
+        if _BARE_ACRONYM_RE.match(variant):
+            pattern = re.compile(
+                r'(?<![A-Za-z])' + re.escape(variant) + r'(?![A-Za-z])')
+            compiled.append((pattern, False, variant, variant))
+
+        # 2. Termini con trattini (es: "Test-Driven Development"):
+        #    permetti match anche con spazi invece dei trattini
+        elif '-' in variant:
+            escaped = re.escape(variant.lower()).replace(r'\-', r'[\s\-]')
+            pattern = re.compile(r'\b' + escaped + r'\b')
+            compiled.append((pattern, True, variant, None))
+
+        # 3. Termini normali: match standard con word boundary
+        else:
+            lowered = variant.lower()
+            pattern = re.compile(r'\b' + re.escape(lowered) + r'\b')
+            compiled.append((pattern, True, variant, lowered))
+
+    return tuple(compiled)
+
+_NEWLINE_RE = re.compile(r'\n')
+
+# Zone in cui i termini del glossario non vanno cercati: commenti LaTeX
+# (% non escapato) e ambienti matematici. Vengono sbiancate prima della
+# scansione mantenendo lunghezza e newline, così offset e numeri di riga
+# restano quelli del testo originale
+_COMMENT_RE = re.compile(r'(?<!\\)%[^\n]*')
+# Argomento URL di \href{...}{testo} e \url{...}: va sbiancato PRIMA dei
+# commenti, perché i % dell'URL-encoding (es. Piano%20di%20Qualifica.pdf)
+# non sono inizi di commento e cancellerebbero il resto della riga,
+# testo visibile del link compreso. Per \href il match si ferma alla
+# prima graffa chiusa: il secondo argomento (il testo) resta scansionabile
+_HREF_URL_RE = re.compile(r'\\(?:href|url)\{[^}]*\}')
+_MATH_ENV_RE = re.compile(
+    r'\\begin\{(equation|align|math|displaymath|eqnarray)(\*?)\}'
+    r'.*?'
+    r'\\end\{\1\2\}', re.DOTALL)
+_NON_NEWLINE_RE = re.compile(r'[^\n]')
+
+def _blank_keep_newlines(match):
+    return _NON_NEWLINE_RE.sub(' ', match.group(0))
+
+def _strip_ignored_regions(text):
+    """
+    Sostituisce con spazi i commenti e gli ambienti matematici: meno
+    byte da scansionare e niente segnalazioni per occorrenze che non
+    compaiono nel documento compilato.
+    """
+    # Prima gli argomenti URL di \href/\url (i loro % non sono commenti)
+    if '\\href' in text or '\\url' in text:
+        text = _HREF_URL_RE.sub(_blank_keep_newlines, text)
+    # I commenti non contengono newline: basta uno spazio per carattere
+    text = _COMMENT_RE.sub(lambda m: ' ' * len(m.group(0)), text)
+    if '\\begin{' in text:
+        text = _MATH_ENV_RE.sub(_blank_keep_newlines, text)
+    return text
+
+def _lower_preserving_length(text):
+    """
+    text.lower() con garanzia di lunghezza invariata: gli span trovati
+    sul testo minuscolo devono valere anche sul testo originale. Per
+    rarissimi caratteri lower() espande (es. 'İ' → 'i̇'); in quel caso
+    si minuscola carattere per carattere tenendo l'originale dove
+    l'espansione cambierebbe gli offset.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+
+    chars = []
+    for ch in text:
+        low = ch.lower()
+        chars.append(low if len(low) == 1 else ch)
+    return ''.join(chars)
+
+# Pattern dei TAG, compilati una volta a livello di modulo in un'unica
+# alternazione: un solo match C-level decide la presenza del TAG invece
+# di fino a quattro tentativi separati per occorrenza
+_TAG_FULL_PATTERN = r'\\textsubscript\{\\scalebox\{0\.6\}\{\\textbf\{G\}\}\}'
+
+_TAG_ANY_RE = re.compile('(?:' + '|'.join((
+    # TAG corto (\G o \G{}), anche preceduto da ) o } (es. \textit{termine}\G)
+    r'[\)\s\}]*\\G(?:\{\})?(?:[^a-zA-Z]|$)',
+    # TAG completo \textsubscript{...}
+    r'[\)\s\}]*' + _TAG_FULL_PATTERN,
+    # TAG (corto o completo) dopo acronimo in parentesi: "Termine
+    # (ACRONIMO)\G", con eventuali spazi, markdown o } intermedi
+    r'[\s\*\_\}]*\([\s\*\_]*[A-Z]{2,}[\s\*\_]*\)[\s\*\_]*'
+    r'\\G(?:\{\})?(?:[^a-zA-Z]|$)',
+    r'[\s\*\_\}]*\([\s\*\_]*[A-Z]{2,}[\s\*\_]*\)[\s\*\_]*' + _TAG_FULL_PATTERN,
+)) + ')', re.ASCII)  # sintassi dei TAG interamente ASCII
+
+def find_occurrences_with_tag(text, term, newline_positions=None, lines=None,
+                              text_lower=None, exclusion_intervals=None):
     """
     Cerca tutte le occorrenze case-insensitive di un termine e le sue varianti.
-    Ritorna lista di tuple: (start, end, lineno, line_text, tag_present, matched_variant)
+    Ritorna lista di tuple: (start, end, lineno, line_text, tag_present,
+    matched_variant, col_start, col_end), con le colonne relative alla
+    riga (già strip-ata) per l'evidenziazione
+
+    newline_positions e lines possono essere precalcolati dal chiamante
+    (una volta per documento) per evitare di ricomputarli a ogni termine.
     
     MODIFICATO: 
     - Ora cerca sia TAG_G_FULL che TAG_G_SHORT
@@ -264,81 +542,95 @@ def find_occurrences_with_tag(text, term):
       tagga sia il termine completo che l'acronimo
     """
     results = []
-    variants = generate_term_variants(term)
-    
-    for variant in variants:
-        # Scegli il pattern regex in base al tipo di variante
-        
-        # 1. Acronimi (solo lettere maiuscole, 2+ caratteri)
-        if re.match(r'^[A-Z]{2,}$', variant):
-            # Per acronimi usa lookahead/lookbehind per evitare match parziali
-            # Es: "POC" non deve matchare "EPOCH"
-            pattern = r'(?<![A-Za-z])' + re.escape(variant) + r'(?![A-Za-z])'
-            flags = 0  # case-sensitive per acronimi
-        
-        # 2. Termini con trattini (es: "Test-Driven Development")
-        elif '-' in variant:
-            # Permetti match anche con spazi invece dei trattini
-            # Es: "Test-Driven" matcha anche "Test Driven"
-            escaped = re.escape(variant).replace(r'\-', r'[\s\-]')
-            pattern = r'\b' + escaped + r'\b'
-            flags = re.IGNORECASE
-        
-        # 3. Termini normali
-        else:
-            # Match standard con word boundary
-            pattern = r'\b' + re.escape(variant) + r'\b'
-            flags = re.IGNORECASE
-        
-        # Cerca tutte le occorrenze
-        for match in re.finditer(pattern, text, flags):
+
+    # Indice delle righe calcolato una sola volta: numero di riga via
+    # ricerca binaria invece di contare i '\n' dall'inizio (O(L)) a ogni
+    # match, e testo della riga preso dalla lista già spezzata
+    if newline_positions is None:
+        newline_positions = [m.start() for m in _NEWLINE_RE.finditer(text)]
+    if lines is None:
+        lines = text.split('\n')
+
+    # Testo minuscolo calcolato una volta: il match case-insensitive
+    # avviene in modo case-sensitive su text_lower con pattern minuscoli
+    # (re.IGNORECASE costa sensibilmente di più sui pattern letterali)
+    if text_lower is None:
+        text_lower = _lower_preserving_length(text)
+
+    # Zone da escludere (URL, path, comandi LaTeX) indicizzate una volta
+    # per documento e passate dal chiamante quando analizza più termini
+    if exclusion_intervals is None:
+        exclusion_intervals = build_exclusion_intervals(text)
+
+    for pattern, use_lower, variant, literal in _compiled_variants(term):
+        haystack = text_lower if use_lower else text
+
+        # Scarto rapido: se la variante non compare nemmeno come
+        # sottostringa (ricerca C-level, molto più economica di una
+        # scansione regex) è inutile lanciare finditer
+        if literal is not None and literal not in haystack:
+            continue
+
+        # Cerca tutte le occorrenze (gli span valgono anche sul testo
+        # originale: lowercasing non cambia le posizioni)
+        for match in pattern.finditer(haystack):
             start, end = match.span()
             
             # SALTA occorrenze all'interno di URL o percorsi file
-            if is_inside_url_or_path(text, start, end):
+            if exclusion_intervals and is_inside_url_or_path(
+                    exclusion_intervals, start, end):
                 continue
             
-            # Trova numero di riga e contenuto riga
-            lineno = text[:start].count('\n') + 1
-            line_start = text.rfind('\n', 0, start) + 1
-            line_end = text.find('\n', end)
-            if line_end == -1:
-                line_end = len(text)
-            line_text = text[line_start:line_end].strip()
-            
-            # Verifica presenza TAG subito dopo il match
-            # MODIFICATO: Cerca ENTRAMBI i formati di TAG come comandi LaTeX
-            after_match = text[end:end+200]
-            
-            # Cerca il TAG corto (\G) - deve essere un comando LaTeX completo
-            # Pattern: \G seguito da qualsiasi carattere NON alfabetico (o fine stringa)
-            # MODIFICATO: Permette anche } e ) prima di \G per gestire \textit{termine}\G e (RTB)\G
-            # Riconosce sia \G che \G{} (con graffe vuote opzionali, comuni in LaTeX)
-            tag_short_match = re.match(r'[\)\s\}]*\\G(?:\{\})?(?:[^a-zA-Z]|$)', after_match)
-            
-            # Cerca il TAG completo - escapa le parentesi graffe ma non i backslash
-            tag_full_pattern = r'\\textsubscript\{\\scalebox\{0\.6\}\{\\textbf\{G\}\}\}'
-            tag_full_match = re.match(r'[\)\s\}]*' + tag_full_pattern, after_match)
-            
-            # NUOVO: Gestione TAG dopo acronimo in parentesi
-            # Pattern: "Termine (ACRONIMO)\G" o "Termine (**ACRONIMO**)\G"
-            # Permette spazi, markdown (*, _), } tra termine e acronimo E dentro le parentesi
-            # La } è necessaria per termini in \textit{...} o \textbf{...}
-            # Riconosce sia \G che \G{} dopo acronimo
-            acronym_with_tag_pattern = r'[\s\*\_\}]*\([\s\*\_]*[A-Z]{2,}[\s\*\_]*\)[\s\*\_]*\\G(?:\{\})?(?:[^a-zA-Z]|$)'
-            acronym_tag_match = re.match(acronym_with_tag_pattern, after_match)
-            
-            # Anche con TAG completo dopo acronimo
-            acronym_with_full_tag_pattern = r'[\s\*\_\}]*\([\s\*\_]*[A-Z]{2,}[\s\*\_]*\)[\s\*\_]*' + tag_full_pattern
-            acronym_full_tag_match = re.match(acronym_with_full_tag_pattern, after_match)
-            
-            tag_present = bool(tag_short_match or tag_full_match or 
-                             acronym_tag_match or acronym_full_tag_match)
-            
-            results.append((start, end, lineno, line_text, tag_present, variant))
+            # Numero di riga: serve sempre (il raggruppamento per riga in
+            # analyze_text considera anche le occorrenze taggate)
+            lineno = bisect_left(newline_positions, start) + 1
+
+            # Verifica presenza TAG subito dopo il match: i pattern
+            # precompilati vengono ancorati con pos/endpos direttamente
+            # sul testo, senza estrarre la finestra di 200 caratteri
+            # (il $ dei pattern corrisponde a endpos come corrispondeva
+            # alla fine della vecchia slice)
+            # Tutte le forme di TAG contengono letteralmente \G oppure
+            # \textsubscript: due str.find C-level (memmem) confermano
+            # l'assenza — il caso di gran lunga più comune — senza mai
+            # avviare il motore regex dell'alternazione
+            probe_end = end + 200
+            tag_present = (
+                (text.find('\\G', end, probe_end) != -1 or
+                 text.find('\\textsubscript', end, probe_end) != -1) and
+                _TAG_ANY_RE.match(text, end, probe_end) is not None)
+
+            # Contenuto riga e colonne solo per le occorrenze senza TAG:
+            # nei documenti ben taggati la maggioranza dei match non
+            # finisce mai nel report e non deve pagarne il costo
+            if tag_present:
+                results.append((start, end, lineno, None, True,
+                                variant, -1, -1))
+                continue
+
+            line_start = newline_positions[lineno - 2] + 1 if lineno > 1 else 0
+            raw_line = lines[lineno - 1]
+            line_text = raw_line.strip()
+            leading_ws = len(raw_line) - len(raw_line.lstrip())
+            col_start = start - line_start - leading_ws
+            col_end = end - line_start - leading_ws
+
+            results.append((start, end, lineno, line_text, False,
+                            variant, col_start, col_end))
     
     return results
 
+def _interval_overlaps(intervals, start, end):
+    """
+    True se [start, end) interseca uno degli intervalli della lista
+    (ordinata per inizio e con intervalli disgiunti): ricerca binaria
+    sull'intervallo che precede start e sguardo al successivo.
+    """
+    i = bisect_right(intervals, (start, sys.maxsize)) - 1
+    if i >= 0 and intervals[i][1] > start:
+        return True
+    return i + 1 < len(intervals) and intervals[i + 1][0] < end
+
 def analyze_text(text, terms, progress_callback=None):
     """
     Analizza un testo LaTeX e trova:
@@ -360,33 +652,60 @@ def analyze_text(text, terms, progress_callback=None):
     terms_not_found = []          # Termini mai citati
     
     # Teniamo traccia delle posizioni già coperte da termini più specifici
-    # per evitare che "Verbale" matchi in "Verbale interno\G"
-    covered_positions = set()
-    
+    # per evitare che "Verbale" matchi in "Verbale interno\G".
+    # Lista ordinata di intervalli (start, end) disgiunti: una tupla per
+    # match invece di un set con un intero per carattere coperto
+    covered = []
+
     total = len(sorted_terms)
-    
+
+    # Indice delle righe e testo minuscolo condivisi da tutte le ricerche
+    # sul documento
+    # La scansione avviene sul testo sbiancato (commenti e ambienti
+    # matematici); righe e offset restano quelli del testo originale,
+    # che viene ancora usato per il contenuto mostrato nel report
+    scan_text = _strip_ignored_regions(text)
+    newline_positions = [m.start() for m in _NEWLINE_RE.finditer(text)]
+    lines = text.split('\n')
+    text_lower = _lower_preserving_length(scan_text)
+    exclusion_intervals = build_exclusion_intervals(scan_text)
+
+    # Prefiltro (Aho-Corasick o alternazioni compilate): un'unica passata
+    # sul testo individua i termini candidati, così la scansione regex
+    # per termine gira solo su quelli; gli altri finiscono subito tra i
+    # non citati
+    candidate_terms = _find_candidate_terms(scan_text, tuple(sorted_terms),
+                                            text_lower)
+
     for i, term in enumerate(sorted_terms):
         if progress_callback and i % 10 == 0:
             progress = (i / total) * 100
             progress_callback(progress, f"Analisi termine {i+1}/{total}...")
-        
+
+        if candidate_terms is not None and term not in candidate_terms:
+            terms_not_found.append(term)
+            continue
+
         # Cerca occorrenze del termine e sue varianti
-        occurrences = find_occurrences_with_tag(text, term)
+        occurrences = find_occurrences_with_tag(scan_text, term,
+                                                newline_positions, lines,
+                                                text_lower,
+                                                exclusion_intervals)
         
         # Filtra le occorrenze che non sono già coperte da termini più specifici
         valid_occurrences = []
-        for start, end, lineno, line_text, tag_present, variant in occurrences:
+        for occurrence in occurrences:
+            start, end = occurrence[0], occurrence[1]
             # Controlla se questa posizione è già stata coperta
-            position_range = set(range(start, end))
-            if not position_range & covered_positions:  # Nessuna sovrapposizione
-                valid_occurrences.append((start, end, lineno, line_text, tag_present, variant))
-                # Marca queste posizioni come coperte
-                covered_positions.update(position_range)
-        
+            if not _interval_overlaps(covered, start, end):  # Nessuna sovrapposizione
+                valid_occurrences.append(occurrence)
+                # Marca l'intervallo come coperto (resta disgiunto dagli altri)
+                insort(covered, (start, end))
+
         if not valid_occurrences:
             # Termine mai citato (o tutte le sue occorrenze erano già coperte)
-            if not any(set(range(s, e)) & covered_positions 
-                      for s, e, _, _, _, _ in occurrences):
+            if not any(_interval_overlaps(covered, occ[0], occ[1])
+                      for occ in occurrences):
                 terms_not_found.append(term)
         else:
             # GESTIONE ACRONIMI: Se almeno UNA variante ha il TAG in una occorrenza,
@@ -394,48 +713,101 @@ def analyze_text(text, terms, progress_callback=None):
             
             # Raggruppa occorrenze per riga
             occurrences_by_line = {}
-            for start, end, lineno, line_text, tag_present, variant in valid_occurrences:
+            for (start, end, lineno, line_text, tag_present, variant,
+                 col_start, col_end) in valid_occurrences:
                 if lineno not in occurrences_by_line:
                     occurrences_by_line[lineno] = []
-                occurrences_by_line[lineno].append((start, end, line_text, tag_present, variant))
-            
+                occurrences_by_line[lineno].append(
+                    (line_text, tag_present, variant, col_start, col_end))
+
             # Per ogni riga, se ALMENO UNA variante ha il TAG, considera tutte taggate
             matches_without_tag = []
             for lineno, line_occurrences in occurrences_by_line.items():
                 # Controlla se almeno una variante in questa riga ha il TAG
-                has_any_tag = any(tag_present for _, _, _, tag_present, _ in line_occurrences)
-                
+                has_any_tag = any(tag_present
+                                  for _, tag_present, _, _, _ in line_occurrences)
+
                 if not has_any_tag:
-                    # Nessuna variante ha il TAG in questa riga, segnala tutte
-                    for start, end, line_text, tag_present, variant in line_occurrences:
-                        matches_without_tag.append((lineno, line_text, variant))
+                    # Nessuna variante ha il TAG in questa riga, segnala
+                    # tutte (con le colonne del match per l'evidenziazione)
+                    for line_text, tag_present, variant, col_start, col_end in line_occurrences:
+                        matches_without_tag.append(
+                            (lineno, line_text, variant, col_start, col_end))
             
             if matches_without_tag:
+                # Congela la lista: da qui in poi è solo letta (meno
+                # overhead di over-allocation e nessuna mutazione accidentale)
                 terms_with_missing_tag[term] = {
                     "total_matches": len(valid_occurrences),
-                    "matches_without_tag": matches_without_tag
+                    "matches_without_tag": tuple(matches_without_tag)
                 }
-    
+
     if progress_callback:
         progress_callback(100, "Analisi completata!")
-    
-    return terms_with_missing_tag, terms_not_found
+
+    return terms_with_missing_tag, tuple(terms_not_found)
+
+def _analyze_file_worker(file_path, terms):
+    """
+    Worker per l'analisi parallela: legge e analizza un singolo file.
+    Sta a livello di modulo per essere serializzabile dai processi figli.
+    Ritorna (file_path, termini_senza_tag, termini_non_citati), o None se
+    il file non è leggibile.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        text = raw.decode("latin-1")
+
+    terms_missing, terms_not_found = analyze_text(text, terms)
+    return file_path, terms_missing, terms_not_found
+
+def _iter_latex(root):
+    """
+    Genera i percorsi dei file .tex/.latex sotto root con os.scandir
+    ricorsivo: le DirEntry riusano le informazioni già restituite dal
+    filesystem senza gli stat aggiuntivi e le liste intermedie di
+    os.walk. I symlink non vengono seguiti (niente cicli) e le directory
+    non leggibili vengono saltate.
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_latex(entry.path)
+                elif (entry.is_file(follow_symlinks=False)
+                      and entry.name.endswith(('.tex', '.latex'))):
+                    yield entry.path
+            except OSError:
+                continue
 
 def find_latex_files(path):
-    """Trova tutti i file .tex in un percorso (file o directory)"""
+    """
+    Trova tutti i file .tex/.latex in un percorso (file o directory),
+    in ordine deterministico
+    """
     if os.path.isfile(path):
-        return [path] if path.endswith('.tex') else []
-    
-    latex_files = []
-    for root, dirs, files in os.walk(path):
-        for file in files:
-            if file.endswith('.tex'):
-                latex_files.append(os.path.join(root, file))
-    
-    return latex_files
+        return [path] if path.endswith(('.tex', '.latex')) else []
+
+    return sorted(_iter_latex(path))
 
 # ---------------------------- GUI ------------------------------------
 
+# Template delle due righe più calde del report (una coppia per
+# occorrenza): il prefisso costante è hoistato a livello di modulo
+_RIGA_TMPL = "        riga %4d: %s\n"
+_VARIANT_TMPL = "                  (trovata variante: '%s')\n"
+
 class GlossaryApp:
     def __init__(self, root):
         self.root = root
@@ -448,7 +820,16 @@ class GlossaryApp:
         
         self.terms_with_missing_tag = None
         self.terms_not_found = None
-        
+        # Ultimo report renderizzato: l'export lo riusa senza rileggere
+        # l'intero buffer del widget attraverso Tcl
+        self._last_results_str = None
+
+        # Coda dei messaggi del thread di analisi, svuotata nel thread
+        # della GUI da _drain_queue
+        self.msg_queue = Queue()
+        self._analysis_running = False
+        self._last_progress_ts = 0.0
+
         self.create_widgets()
         
     def create_widgets(self):
@@ -517,10 +898,15 @@ class GlossaryApp:
         results_frame = ttk.LabelFrame(self.root, text="📊 4. Risultati", padding=10)
         results_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
-        # Area testo con scrollbar
+        # Area testo con scrollbar. undo esplicitamente spento: il widget
+        # è di sola visualizzazione e su report da megabyte la delete in
+        # clear_results non deve alimentare uno stack di undo
+        # state='disabled': il widget resta in sola lettura e viene
+        # riabilitato solo attorno alle mutazioni in blocco, così gli
+        # insert non programmano redraw con l'editing attivo
         self.results_text = scrolledtext.ScrolledText(
-            results_frame, wrap=tk.WORD, width=100, height=20, 
-            font=("Courier", 9))
+            results_frame, wrap=tk.WORD, width=100, height=20,
+            font=("Courier", 9), undo=False, state='disabled')
         self.results_text.pack(fill="both", expand=True)
         
         # Pulsanti azioni
@@ -567,12 +953,51 @@ class GlossaryApp:
         self.glossary_progress_label.config(text=message)
         self.root.update_idletasks()
     
-    def update_analysis_progress(self, value, message):
-        """Aggiorna la progress bar dell'analisi"""
-        self.analysis_progress['value'] = value
-        self.analysis_progress_label.config(text=message)
-        self.root.update_idletasks()
-            
+    def _post_progress(self, value, message, force=False):
+        """
+        Accoda un aggiornamento di progresso dal thread di analisi.
+        Throttling a ~30 Hz: il loop di analisi non paga un refresh Tk
+        per ogni termine elaborato.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_progress_ts < 0.033:
+            return
+        self._last_progress_ts = now
+        self.msg_queue.put(('progress', (value, message)))
+
+    def _drain_queue(self):
+        """Svuota la coda dei messaggi del worker nel thread della GUI"""
+        done = False
+        while True:
+            try:
+                msg_type, data = self.msg_queue.get_nowait()
+            except Empty:
+                break
+
+            if msg_type == 'progress':
+                value, message = data
+                self.analysis_progress['value'] = value
+                self.analysis_progress_label.config(text=message)
+            elif msg_type == 'warning':
+                messagebox.showwarning("Attenzione", data)
+                done = True
+            elif msg_type == 'error':
+                messagebox.showerror("Errore", f"Errore durante l'analisi:\n{data}")
+                done = True
+            elif msg_type == 'done':
+                all_results, latex_files = data
+                self.display_results(all_results, latex_files)
+                done = True
+
+        if done:
+            self._analysis_running = False
+            self.root.config(cursor="")
+            self.analysis_progress['value'] = 0
+            self.analysis_progress_label.config(text="")
+        else:
+            self.root.after(33, self._drain_queue)
+
+
     def load_glossary(self):
         """Carica i termini dal glossario"""
         glossary_path = self.glossary_path_var.get().strip()
@@ -608,170 +1033,282 @@ class GlossaryApp:
             self.glossary_progress_label.config(text="")
             
     def run_analysis(self):
-        """Esegue l'analisi del documento o della cartella"""
+        """Avvia l'analisi del documento o della cartella in background"""
         if not self.terms:
             messagebox.showwarning("Attenzione", "Carica prima i termini dal glossario.")
             return
-            
+
         doc_path = self.doc_path_var.get().strip()
         if not doc_path:
             messagebox.showwarning("Attenzione", "Seleziona un file o una cartella da analizzare.")
             return
-            
+
         if not os.path.exists(doc_path):
             messagebox.showerror("Errore", f"Percorso non trovato: {doc_path}")
             return
-        
+
+        if self._analysis_running:
+            return  # analisi già in corso
+
+        self._analysis_running = True
+        self._last_progress_ts = 0.0
         self.root.config(cursor="watch")
         self.analysis_progress['value'] = 0
-        
+
+        # L'analisi gira su un thread separato: la GUI resta reattiva e
+        # il loop non viene serializzato sui refresh di Tk. I risultati
+        # tornano al thread principale attraverso la coda
+        threading.Thread(target=self._analysis_task, args=(doc_path,),
+                         daemon=True).start()
+        self.root.after(33, self._drain_queue)
+
+    def _analysis_task(self, doc_path):
+        """Corpo dell'analisi, eseguito sul thread worker"""
         try:
             # Trova i file da analizzare
             latex_files = find_latex_files(doc_path)
-            
+
+            # Nelle cartelle, scarta gli stub minuscoli (preamboli, file
+            # di soli \input): sotto i 256 byte non c'è prosa che possa
+            # citare termini del glossario, inutile scansionarli. Un file
+            # selezionato esplicitamente viene sempre analizzato
+            if os.path.isdir(doc_path):
+                latex_files = [fp for fp in latex_files
+                               if os.path.getsize(fp) >= 256]
+
             if not latex_files:
-                messagebox.showwarning("Attenzione", "Nessun file LaTeX trovato nel percorso selezionato.")
+                self.msg_queue.put(
+                    ('warning', "Nessun file LaTeX trovato nel percorso selezionato."))
                 return
-            
-            self.update_analysis_progress(0, f"Trovati {len(latex_files)} file da analizzare...")
-            
+
+            self._post_progress(
+                0, f"Trovati {len(latex_files)} file da analizzare...", force=True)
+
             # Analizza tutti i file
             all_results = {}
             total_files = len(latex_files)
-            
+
+            if total_files > 1:
+                # I file sono indipendenti: un processo per file aggira
+                # il GIL sul lavoro regex e scala con i core. I risultati
+                # arrivano in ordine di completamento e vengono riordinati
+                # secondo la lista dei file per un output deterministico
+                collected = {}
+                completed = 0
+                with ProcessPoolExecutor() as executor:
+                    futures = {
+                        executor.submit(_analyze_file_worker, fp, self.terms): fp
+                        for fp in latex_files
+                    }
+                    for future in as_completed(futures):
+                        completed += 1
+                        self._post_progress(
+                            (completed / total_files) * 100,
+                            f"Analizzati {completed}/{total_files} file...")
+
+                        result = future.result()
+                        if result is None:
+                            continue  # file non leggibile
+                        file_path, terms_missing, terms_not_found = result
+                        if terms_missing or terms_not_found:
+                            collected[file_path] = {
+                                'missing_tag': terms_missing,
+                                'not_found': terms_not_found
+                            }
+
+                all_results = {fp: collected[fp] for fp in latex_files
+                               if fp in collected}
+
+                self._post_progress(100, "Analisi completata!", force=True)
+                self.msg_queue.put(('done', (all_results, latex_files)))
+                return
+
             for i, file_path in enumerate(latex_files):
                 file_progress = (i / total_files) * 100
-                self.update_analysis_progress(
-                    file_progress, 
+                self._post_progress(
+                    file_progress,
                     f"Analisi file {i+1}/{total_files}: {os.path.basename(file_path)}..."
                 )
-                
-                # Leggi il file
+
+                # Leggi il file una volta sola in binario e decodifica in
+                # memoria: il vecchio fallback latin-1 riapriva e rileggeva
+                # il file da disco una seconda volta
                 try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        text = f.read()
-                except Exception:
-                    try:
-                        with open(file_path, "r", encoding="latin-1") as f:
-                            text = f.read()
-                    except Exception:
-                        continue  # Salta file non leggibili
-                
+                    with open(file_path, "rb") as f:
+                        raw = f.read()
+                except OSError:
+                    continue  # Salta file non leggibili
+                try:
+                    text = raw.decode("utf-8")
+                except UnicodeDecodeError:
+                    text = raw.decode("latin-1")
+                del raw
+
                 # Analizza
                 terms_missing, terms_not_found = analyze_text(
-                    text, self.terms, 
-                    lambda p, m: self.update_analysis_progress(
+                    text, self.terms,
+                    lambda p, m: self._post_progress(
                         file_progress + (p / total_files), m
                     )
                 )
-                
+
                 if terms_missing or terms_not_found:
                     all_results[file_path] = {
                         'missing_tag': terms_missing,
                         'not_found': terms_not_found
                     }
-            
-            self.update_analysis_progress(100, "Analisi completata!")
-            
-            # Mostra risultati
-            self.display_results(all_results, latex_files)
-            
+
+            self._post_progress(100, "Analisi completata!", force=True)
+            self.msg_queue.put(('done', (all_results, latex_files)))
+
         except Exception as e:
-            messagebox.showerror("Errore", f"Errore durante l'analisi:\n{e}")
-        finally:
-            self.root.config(cursor="")
-            self.analysis_progress['value'] = 0
-            self.analysis_progress_label.config(text="")
-            
+            self.msg_queue.put(('error', str(e)))
+
+
+    def _set_results_text(self, report):
+        """
+        Sostituisce il contenuto del widget dei risultati in un'unica
+        mutazione: abilita, svuota, inserisce il report già assemblato,
+        ridisabilita e chiede un solo refresh a fine blocco.
+        """
+        self.results_text.config(state='normal')
+        self.results_text.delete("1.0", tk.END)
+        self.results_text.insert(tk.END, report)
+        self.results_text.config(state='disabled')
+        self.results_text.update_idletasks()
+
     def display_results(self, all_results, all_files):
         """Mostra i risultati dell'analisi"""
-        self.results_text.delete("1.0", tk.END)
-        
+
+        # Il report viene accumulato in una lista di frammenti e inserito
+        # nel widget con una sola insert: ogni insert separata costa un
+        # round-trip Tk (redraw, geometria della scrollbar).
+        # Il bound method viene risolto una volta sola: nel ciclo caldo
+        # evita lookup di attributo e binding a ogni frammento
+        parts = []
+        append = parts.append
+
+        # Conteggi legati una volta a locali: ricorrono in header,
+        # riepilogo e dialoghi
+        n_problems = len(all_results)
+        n_total = len(all_files)
+
         # Header
-        header = (f"📊 ANALISI COMPLETATA\n"
-                 f"📚 Termini nel glossario: {len(self.terms)}\n"
-                 f"📄 File analizzati: {len(all_files)}\n"
-                 f"🏷️  TAG riconosciuti: \\textsubscript{{...}} e \\G\n"
-                 f"{'='*70}\n\n")
-        self.results_text.insert(tk.END, header)
-        
+        append(f"📊 ANALISI COMPLETATA\n"
+               f"📚 Termini nel glossario: {len(self.terms)}\n"
+               f"📄 File analizzati: {n_total}\n"
+               f"🏷️  TAG riconosciuti: \\textsubscript{{...}} e \\G\n"
+               f"{'='*70}\n\n")
+
         if not all_results:
-            self.results_text.insert(tk.END, 
+            append(
                 "🎉 PERFETTO! Nessun problema trovato in tutti i file analizzati!\n\n"
                 "✅ Tutti i termini del glossario presenti hanno il TAG G corretto.\n")
-            
-            messagebox.showinfo("Analisi Completata", 
-                              "✅ Nessun problema trovato!\n\n"
-                              f"• Analizzati {len(all_files)} file\n"
-                              "• Tutti i termini presenti hanno il TAG G")
+            report = ''.join(parts)
+            self._last_results_str = report
+            self._set_results_text(report)
+
+            # Dialogo rimandato a dopo il rendering: showinfo è modale e
+            # bloccherebbe la GUI con il report appena inserito
+            self.root.after_idle(lambda: messagebox.showinfo(
+                "Analisi Completata",
+                "✅ Nessun problema trovato!\n\n"
+                f"• Analizzati {n_total} file\n"
+                "• Tutti i termini presenti hanno il TAG G"))
             return
-        
+
+        # Totali calcolati in una passata di aggregazione separata: il
+        # ciclo di rendering resta privo di contabilità
+        total_not_found = sum(len(r['not_found'])
+                              for r in all_results.values())
+        total_missing_tags = sum(len(m['matches_without_tag'])
+                                 for r in all_results.values()
+                                 for m in r['missing_tag'].values())
+
         # Mostra problemi per ogni file
-        total_not_found = 0
-        total_missing_tags = 0
-        
         for file_path, results in all_results.items():
-            self.results_text.insert(tk.END, 
-                f"📄 {os.path.basename(file_path)}\n")
-            self.results_text.insert(tk.END, 
-                f"   Percorso: {file_path}\n")
-            
+            append(f"📄 {os.path.basename(file_path)}\n")
+            append(f"   Percorso: {file_path}\n")
+
+            # Accessi al dict risolti una volta per file
+            not_found = results['not_found']
+            missing = results['missing_tag']
+
             # Termini non trovati
-            if results['not_found']:
-                total_not_found += len(results['not_found'])
-                self.results_text.insert(tk.END, 
-                    f"   ❌ Termini non presenti nel documento: {len(results['not_found'])}\n")
-            
+            if not_found:
+                append(
+                    f"   ❌ Termini non presenti nel documento: {len(not_found)}\n")
+
             # Termini senza TAG
-            if results['missing_tag']:
-                count = sum(len(v["matches_without_tag"]) 
-                          for v in results['missing_tag'].values())
-                total_missing_tags += count
-                
-                self.results_text.insert(tk.END, 
+            if missing:
+                count = sum(len(v["matches_without_tag"])
+                          for v in missing.values())
+
+                append(
                     f"   ⚠️  Termini presenti ma SENZA TAG G: "
-                    f"{len(results['missing_tag'])} termini ({count} occorrenze)\n")
-                
-                for phrase, data in results['missing_tag'].items():
-                    self.results_text.insert(tk.END, f"      • {phrase}:\n")
-                    
-                    for ln, line_text, variant in data["matches_without_tag"]:
-                        # Tronca il testo se troppo lungo
-                        if len(line_text) > 80:
-                            line_text = line_text[:77] + "..."
-                        
-                        # Evidenzia la variante trovata
-                        highlighted_text = line_text
-                        if variant in line_text:
-                            highlighted_text = line_text.replace(variant, f"**{variant}**")
-                        
-                        self.results_text.insert(tk.END, 
-                            f"        riga {ln:4d}: {highlighted_text}\n")
-                        self.results_text.insert(tk.END,
-                            f"                  (trovata variante: '{variant}')\n")
-            
-            self.results_text.insert(tk.END, "\n")
-        
+                    f"{len(missing)} termini ({count} occorrenze)\n")
+
+                for phrase, data in missing.items():
+                    append(f"      • {phrase}:\n")
+
+                    for ln, line_text, variant, col_start, col_end in data["matches_without_tag"]:
+                        # Evidenzia il match usando gli offset salvati:
+                        # nessuna ricerca nella riga, e l'evidenziazione
+                        # funziona anche quando il case nel testo
+                        # differisce da quello della variante
+                        if 0 <= col_start <= col_end <= len(line_text):
+                            line_text = (line_text[:col_start] + "**" +
+                                         line_text[col_start:col_end] + "**" +
+                                         line_text[col_end:])
+                            highlight_end = col_end + 4  # i 4 caratteri dei marcatori
+                        else:
+                            highlight_end = 0
+
+                        # Tronca il testo se troppo lungo (80 + i 4
+                        # caratteri dei marcatori), spostando la finestra
+                        # se serve perché l'evidenziazione resti visibile
+                        if len(line_text) > 84:
+                            if highlight_end <= 81:
+                                line_text = line_text[:81] + "..."
+                            else:
+                                line_text = ("..." +
+                                             line_text[highlight_end - 78:
+                                                       highlight_end] + "...")
+
+                        append(_RIGA_TMPL % (ln, line_text))
+                        append(_VARIANT_TMPL % variant)
+
+            append("\n")
+
         # Riepilogo finale
-        summary = (f"{'='*70}\n"
-                  f"📊 RIEPILOGO TOTALE:\n"
-                  f"   • File con problemi: {len(all_results)}/{len(all_files)}\n")
-        
+        append(f"{'='*70}\n"
+               f"📊 RIEPILOGO TOTALE:\n"
+               f"   • File con problemi: {n_problems}/{n_total}\n")
+
         if total_not_found > 0:
-            summary += f"   • Totale termini non presenti: {total_not_found}\n"
+            append(f"   • Totale termini non presenti: {total_not_found}\n")
         if total_missing_tags > 0:
-            summary += f"   • Totale occorrenze senza TAG G: {total_missing_tags}\n"
-        
-        self.results_text.insert(tk.END, summary)
-        
-        messagebox.showwarning("Problemi Trovati", 
-            f"Trovati problemi in {len(all_results)}/{len(all_files)} file:\n\n"
-            f"• Termini non presenti: {total_not_found}\n"
-            f"• Occorrenze senza TAG G: {total_missing_tags}")
+            append(f"   • Totale occorrenze senza TAG G: {total_missing_tags}\n")
+
+        report = ''.join(parts)
+        self._last_results_str = report
+        self._set_results_text(report)
+
+        # Dialogo modale rimandato con after_idle: il report è già
+        # visibile (ed esportabile) prima che l'utente debba chiudere
+        # l'avviso; nessun avviso se non c'è nulla da segnalare
+        if total_not_found + total_missing_tags > 0:
+            self.root.after_idle(lambda: messagebox.showwarning(
+                "Problemi Trovati",
+                f"Trovati problemi in {n_problems}/{n_total} file:\n\n"
+                f"• Termini non presenti: {total_not_found}\n"
+                f"• Occorrenze senza TAG G: {total_missing_tags}"))
         
     def export_results(self):
         """Esporta i risultati"""
-        if not self.results_text.get("1.0", "end-1c"):
+        # Controllo di vuotezza O(1) sull'indice: get("1.0", "end-1c")
+        # copierebbe l'intero buffer attraverso Tcl solo per testarlo
+        if self.results_text.index("end-1c") == "1.0":
             messagebox.showwarning("Attenzione", "Nessun risultato da esportare.")
             return
             
@@ -782,26 +1319,36 @@ class GlossaryApp:
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write("=== SCANNER GLOSSARIO AUTOMATICO - RISULTATI (v2.1) ===\n\n")
-                    f.write(f"Termini glossario: {len(self.terms)}\n")
-                    f.write(f"File glossario: {self.glossary_path_var.get()}\n\n")
-                    f.write("FUNZIONALITÀ:\n")
-                    f.write("• Gestione acronimi: POC (Proof of Concept) → cerca POC e Proof of Concept\n")
-                    f.write("• Gestione traduzioni: Affidabilità (Reliability) → cerca entrambe\n")
-                    f.write("• Supporto TAG: \\textsubscript{\\scalebox{0.6}{\\textbf{G}}} e \\G\n")
-                    f.write("• Ricerca case-insensitive migliorata\n\n")
-                    f.write(self.results_text.get("1.0", tk.END))
-                    
+                # Un'unica writelines dei frammenti invece di tante write;
+                # buffer da 64 KB per ridurre le syscall sui report grandi
+                with open(filename, 'w', encoding='utf-8',
+                          buffering=1 << 16) as f:
+                    f.writelines((
+                        "=== SCANNER GLOSSARIO AUTOMATICO - RISULTATI (v2.1) ===\n\n",
+                        f"Termini glossario: {len(self.terms)}\n",
+                        f"File glossario: {self.glossary_path_var.get()}\n\n",
+                        "FUNZIONALITÀ:\n",
+                        "• Gestione acronimi: POC (Proof of Concept) → cerca POC e Proof of Concept\n",
+                        "• Gestione traduzioni: Affidabilità (Reliability) → cerca entrambe\n",
+                        "• Supporto TAG: \\textsubscript{\\scalebox{0.6}{\\textbf{G}}} e \\G\n",
+                        "• Ricerca case-insensitive migliorata\n\n",
+                        # Report già in memoria lato Python: niente
+                        # marshaling dell'intero buffer da Tcl
+                        self._last_results_str
+                        if self._last_results_str is not None
+                        else self.results_text.get("1.0", tk.END),
+                    ))
+
                 messagebox.showinfo("Successo", f"Risultati esportati in:\n{filename}")
             except Exception as e:
                 messagebox.showerror("Errore", f"Impossibile esportare:\n{e}")
                 
     def clear_results(self):
         """Pulisce i risultati"""
-        self.results_text.delete("1.0", tk.END)
+        self._set_results_text("")
         self.terms_with_missing_tag = None
         self.terms_not_found = None
+        self._last_results_str = None
 
 # ---------------------------- MAIN ------------------------------------
 
@@ -0,0 +1,26 @@
+"""Tabella di escape LaTeX condivisa tra gli script del glossario.
+
+La tabella viene costruita una sola volta all'import del modulo e copre
+tutti i caratteri speciali LaTeX (non solo & % $ #): un carattere non
+escapato in una definizione produce un .tex che non compila. str.translate
+applica la tabella in un'unica passata C-level, anche con sostituzioni
+multi-carattere come \\textasciitilde{}.
+"""
+
+_TABLE = str.maketrans({
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+    '\\': r'\textbackslash{}',
+})
+
+
+def escape(text):
+    """Escapa i caratteri speciali LaTeX in `text`."""
+    return text.translate(_TABLE)
@@ -5,15 +5,37 @@
 # - Evita duplicazioni
 # - Gestisce plurali base (aggiunta di 's')
 
+import argparse
+import functools
+from array import array
 import json
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# orjson (se installato) decodifica i bytes direttamente, 2-3x piu'
+# veloce dello stdlib su payload ricchi di stringhe come il glossario
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Pattern dei controlli di contesto, compilati una volta all'import.
+# Il marcatore può seguire anche parentesi o graffe di chiusura, come in
+# "Baseline\G{} (RTB)\G{}": il match dentro "(RTB)" vede ")\G{" dopo di sé
+_AFTER_G_RE = re.compile(r'[\s\)\}]*\\G\{')
+_LATEX_CMD_RE = re.compile(r'\\[a-zA-Z]+\s*{[^}]*$')
+_URL_RE = re.compile(r'(https?://|\\url\{|\\path\{)[^\s}]*$')
+
 def load_glossary_terms(glossary_path):
     """Carica i termini dal glossario JSON"""
-    with open(glossary_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(glossary_path, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(glossary_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
     terms = []
     if isinstance(data, dict) and "terms" in data:
         for entry in data["terms"]:
@@ -25,14 +47,56 @@ def load_glossary_terms(glossary_path):
                 terms.append(entry["term"])
     return terms
 
+@functools.lru_cache(maxsize=None)
 def clean_term(term):
-    """Rimuove parentesi e contenuto tra parentesi dal termine"""
+    """Rimuove parentesi e contenuto tra parentesi dal termine
+    (memoizzato: processando più file gli stessi termini del glossario
+    vengono ripuliti una volta sola)"""
     # "AI (Artificial Intelligence)" -> "AI"
     cleaned = re.sub(r'\s*\([^)]*\)', '', term).strip()
     return cleaned
 
+def _trie_regex(terms):
+    """
+    Rende i termini come regex a trie con prefissi condivisi:
+    ("rete", "reti") -> "ret(?:e|i)". A ogni posizione il motore
+    confronta un carattere per nodo invece di riprovare dall'inizio
+    ogni alternativa piatta; il ramo di fine termine è opzionale e
+    viene tentato dopo i figli, così vince sempre il match più lungo.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def render(node):
+        is_end = '' in node
+        branches = [re.escape(ch) + render(child)
+                    for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 \
+            else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if is_end else body
+
+    return render(trie)
+
+@functools.lru_cache(maxsize=16)
+def _compile_terms_pattern(terms):
+    """
+    Compila (e memoizza) l'alternazione dei termini (già minuscoli):
+    eseguendo lo script su più file con lo stesso glossario il pattern
+    combinato viene costruito una volta sola. Niente IGNORECASE: il
+    match avviene in modo case-sensitive sul testo minuscolizzato,
+    senza pagare il case-folding Unicode a ogni carattere.
+    """
+    return re.compile(rf'\b(?:{_trie_regex(terms)})s?\b')
+
 def add_G_suffix(tex_text, glossary_terms):
-    """Aggiunge \G dopo ogni occorrenza dei termini del glossario"""
+    """Aggiunge \G dopo ogni occorrenza dei termini del glossario.
+    Ritorna (testo aggiornato, numero di marcatori aggiunti)."""
     
     # Prepara i termini puliti
     processed_terms = []
@@ -43,142 +107,227 @@ def add_G_suffix(tex_text, glossary_terms):
         if clean:
             processed_terms.append(clean)
     
-    # Rimuovi duplicati e ordina per lunghezza decrescente
-    # (i termini più lunghi devono essere processati prima per evitare conflitti)
-    processed_terms = sorted(set(processed_terms), key=lambda s: len(s), reverse=True)
-    
+    # Minuscoli (il match è case-insensitive per costruzione), senza
+    # duplicati e in ordine deterministico per la cache del pattern
+    processed_terms = sorted({term.lower() for term in processed_terms},
+                             key=lambda s: (-len(s), s))
+
+    if not processed_terms:
+        print("✅ Aggiunti 0 marcatori \\G{}")
+        return tex_text, 0
+
     print(f"🔍 Processando {len(processed_terms)} termini unici...")
-    
-    modifiche = 0
-    
-    for term in processed_terms:
-        # Escape caratteri speciali per regex
-        base = re.escape(term)
-        
-        # Pattern che matcha:
-        # - Il termine esatto (case-insensitive)
-        # - Con opzionale 's' alla fine per plurali semplici
-        # - Come parola completa (\b = word boundary)
-        # - NON già seguito da \G{}
-        pattern = re.compile(
-            rf'\b({base})s?\b(?!\s*\\G\{{\}})',
-            flags=re.IGNORECASE
-        )
-        
-        matches = list(pattern.finditer(tex_text))
-        
-        if matches:
-            # Processa i match dall'ultimo al primo per non invalidare gli indici
-            for match in reversed(matches):
-                matched_text = match.group(0)
-                start_pos = match.start()
-                end_pos = match.end()
-                
-                # Controlla contesto prima del match
-                before_context = tex_text[max(0, start_pos-20):start_pos]
-                
-                # Controlla contesto dopo il match
-                after_context = tex_text[end_pos:min(len(tex_text), end_pos+10)]
-                
-                # Salta se già c'è \G{} nelle immediate vicinanze
-                if '\\G{' in before_context[-10:] or '\\G{' in after_context[:5]:
-                    continue
-                
-                # Salta se siamo dentro un comando LaTeX tipo \newcommand, \def, ecc.
-                if re.search(r'\\[a-zA-Z]+\s*{[^}]*$', before_context):
-                    continue
-                
-                # Salta se siamo in un URL o path
-                if re.search(r'(https?://|\\url\{|\\path\{)[^\s}]*$', before_context):
-                    continue
-                
-                # Inserisci \G{} subito dopo il termine
-                tex_text = tex_text[:end_pos] + r'\G{}' + tex_text[end_pos:]
-                modifiche += 1
-    
-    print(f"✅ Aggiunti {modifiche} marcatori \\G{{}}")
-    return tex_text
+
+    # Un'unica alternazione compilata di tutti i termini: il trie fa
+    # vincere il match più lungo ("Verbale interno" non viene mai
+    # marcato anche come "Verbale") e la scansione è una sola passata di
+    # finditer invece di una per termine.
+    # Il controllo "già seguito da \G{}" avviene in Python e non con un
+    # lookahead nel pattern: se il lookahead fallisse sul termine lungo
+    # già marcato, il motore arretrerebbe sull'alternativa più corta e
+    # marcherebbe "Verbale" dentro "Verbale interno\G{}"
+    pattern = _compile_terms_pattern(tuple(processed_terms))
+
+    # Il case-folding avviene una volta sola: la scansione corre sul
+    # testo minuscolizzato (gli offset coincidono) e gli inserimenti e i
+    # controlli di contesto usano il testo originale
+    low = tex_text.lower()
+    if len(low) != len(tex_text):
+        # Rarissimi caratteri si espandono con lower(): minuscola per
+        # carattere mantenendo la lunghezza, così gli offset restano validi
+        low = ''.join(c.lower() if len(c.lower()) == 1 else c
+                      for c in tex_text)
+
+    # Raccoglie le posizioni di inserimento in una passata sul testo
+    # originale e ricostruisce l'output con un'unica join: l'inserimento
+    # in loop (tex_text[:pos] + ... + tex_text[pos:]) ricopiava l'intero
+    # documento a ogni marcatore. finditer viene consumato in streaming
+    # (mai materializzato in lista di Match) e le posizioni vivono in un
+    # array di int a 32 bit invece che in una lista di PyLong
+    insert_at = array('i')
+
+    for match in pattern.finditer(low):
+        start_pos = match.start()
+        end_pos = match.end()
+
+        # Controlla contesto prima del match
+        before_context = tex_text[max(0, start_pos-20):start_pos]
+
+        # Controlla contesto dopo il match
+        after_context = tex_text[end_pos:min(len(tex_text), end_pos+10)]
+
+        # Salta se già c'è \G{} nelle immediate vicinanze o subito dopo
+        if ('\\G{' in before_context[-10:] or
+                _AFTER_G_RE.match(after_context)):
+            continue
+
+        # Salta se siamo dentro un comando LaTeX tipo \newcommand, \def, ecc.
+        if _LATEX_CMD_RE.search(before_context):
+            continue
+
+        # Salta se siamo in un URL o path
+        if _URL_RE.search(before_context):
+            continue
+
+        # Inserisci \G{} subito dopo il termine
+        insert_at.append(end_pos)
+
+    parts = []
+    prev = 0
+    for pos in insert_at:
+        parts.append(tex_text[prev:pos])
+        parts.append(r'\G{}')
+        prev = pos
+    parts.append(tex_text[prev:])
+
+    print(f"✅ Aggiunti {len(insert_at)} marcatori \\G{{}}")
+    return ''.join(parts), len(insert_at)
+
+def _process_file(tex_path, terms):
+    """Legge, marca e riscrive un singolo file .tex; ritorna il numero
+    di marcatori aggiunti. Funzione top-level così i worker di
+    ProcessPoolExecutor possono riceverla via pickle."""
+    tex_text = tex_path.read_text(encoding="utf-8")
+    updated, modifiche = add_G_suffix(tex_text, terms)
+    if modifiche > 0:
+        tex_path.write_text(updated, encoding="utf-8")
+    return modifiche
+
+def _resolve_tex_path(tex_file):
+    """Risolve un percorso (relativo alla radice del progetto) e lo
+    valida; ritorna il Path oppure None con un messaggio di errore."""
+    # Se il percorso è relativo, assumi che sia relativo alla radice del progetto
+    if not Path(tex_file).is_absolute():
+        tex_path = Path(__file__).parent.parent.parent / tex_file
+    else:
+        tex_path = Path(tex_file)
+
+    if not tex_path.exists():
+        print(f"❌ File non trovato: {tex_path}")
+        print("💡 Esempi di percorsi validi:")
+        print("   RTB/NORME DI PROGETTO/Norme di Progetto.tex")
+        print("   RTB/VERBALI/INTERNI/VI_12-11-25/VI_12-11-25.tex")
+        return None
+
+    if tex_path.suffix.lower() != '.tex':
+        print("❌ Il file deve avere estensione .tex")
+        return None
+
+    return tex_path
 
 def main():
+    # In modalità batch (file sull'argv) un solo processo elabora tutti i
+    # file: glossario caricato e pattern compilato una volta sola, invece
+    # di pagare avvio Python + caricamento a ogni invocazione
+    parser = argparse.ArgumentParser(
+        description="Aggiunge i marcatori \\G{} ai termini del glossario nei file .tex")
+    parser.add_argument('files', nargs='*',
+                        help="file .tex da elaborare (percorsi relativi alla radice "
+                             "del progetto); senza argomenti chiede il percorso "
+                             "interattivamente")
+    parser.add_argument('-y', '--yes', action='store_true',
+                        help="procedi senza chiedere conferma")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="numero di processi paralleli in modalità batch "
+                             "(default 1; i file sono indipendenti, quindi la "
+                             "marcatura scala con i core)")
+    args = parser.parse_args()
+
     # Percorso fisso per il glossario
     glossary_path = Path(__file__).parent.parent.parent / "SITO" / "glossario.json"
-    
+
     if not glossary_path.exists():
         print("❌ Errore: glossario non trovato al percorso:", glossary_path)
         sys.exit(1)
-    
-    # Chiedi all'utente quale file modificare
+
     print("=" * 60)
     print("📖 Script per aggiungere \\G{{}} ai termini del glossario")
     print("=" * 60)
     print(f"📚 Glossario: {glossary_path.name}")
     print()
-    
-    while True:
-        tex_file = input("📄 Inserisci il percorso del file .tex (relativo alla radice): ").strip()
-        if not tex_file:
-            print("❌ Percorso vuoto. Riprova.")
-            continue
-            
-        # Se il percorso è relativo, assumi che sia relativo alla radice del progetto
-        if not Path(tex_file).is_absolute():
-            tex_path = Path(__file__).parent.parent.parent / tex_file
-        else:
-            tex_path = Path(tex_file)
-            
-        if not tex_path.exists():
-            print(f"❌ File non trovato: {tex_path}")
-            print("💡 Esempi di percorsi validi:")
-            print("   RTB/NORME DI PROGETTO/Norme di Progetto.tex")
-            print("   RTB/VERBALI/INTERNI/VI_12-11-25/VI_12-11-25.tex")
-            continue
-            
-        if tex_path.suffix.lower() != '.tex':
-            print("❌ Il file deve avere estensione .tex")
-            continue
-            
-        break
-    
-    print(f"\n📄 File selezionato: {tex_path.relative_to(tex_path.parent.parent.parent)}")
-    
+
+    if args.files:
+        tex_paths = []
+        for tex_file in args.files:
+            tex_path = _resolve_tex_path(tex_file)
+            if tex_path is None:
+                sys.exit(1)
+            tex_paths.append(tex_path)
+    else:
+        # Chiedi all'utente quale file modificare
+        while True:
+            tex_file = input("📄 Inserisci il percorso del file .tex (relativo alla radice): ").strip()
+            if not tex_file:
+                print("❌ Percorso vuoto. Riprova.")
+                continue
+            tex_path = _resolve_tex_path(tex_file)
+            if tex_path is not None:
+                break
+        tex_paths = [tex_path]
+
+    print(f"\n📄 File selezionati: {len(tex_paths)}")
+    for tex_path in tex_paths:
+        print(f"   - {tex_path}")
+
     # Conferma
-    print()
-    conferma = input("⚠️  Vuoi procedere con la modifica? (s/N): ").strip().lower()
-    if conferma not in ['s', 'si', 'sì', 'y', 'yes']:
-        print("❌ Operazione annullata.")
-        return
-    
+    if not args.yes:
+        print()
+        conferma = input("⚠️  Vuoi procedere con la modifica? (s/N): ").strip().lower()
+        if conferma not in ['s', 'si', 'sì', 'y', 'yes']:
+            print("❌ Operazione annullata.")
+            return
+
     print("\n" + "=" * 60)
-    
+
     # Carica e processa
     try:
-        print("📖 Lettura file...")
-        tex_text = tex_path.read_text(encoding="utf-8")
-        original_G_count = tex_text.count('\\G{}')
-        
-        print("📚 Caricamento glossario...")
-        terms = load_glossary_terms(glossary_path)
-        print(f"✅ Caricati {len(terms)} termini dal glossario")
-        
-        print("\n🔄 Elaborazione in corso...")
-        updated = add_G_suffix(tex_text, terms)
-        
-        # Conta le modifiche effettive
-        new_G_count = updated.count('\\G{}')
-        modifiche = new_G_count - original_G_count
-        
-        if modifiche > 0:
-            # Salva il file
-            tex_path.write_text(updated, encoding="utf-8")
-            print(f"\n✅ File modificato con successo!")
-            print(f"📊 Marcatori \\G{{}} prima: {original_G_count}")
-            print(f"📊 Marcatori \\G{{}} dopo: {new_G_count}")
-            print(f"📊 Nuovi marcatori: {modifiche}")
+        totale = 0
+        n_jobs = min(args.jobs, len(tex_paths))
+        if n_jobs > 1:
+            # File indipendenti -> elaborazione embarrassingly parallel:
+            # un processo per file aggira il GIL (la sostituzione è
+            # CPU-bound); il glossario è piccolo e viaggia via pickle
+            print(f"📚 Caricamento glossario...")
+            terms = load_glossary_terms(glossary_path)
+            print(f"✅ Caricati {len(terms)} termini dal glossario")
+            print(f"\n🔄 Elaborazione su {n_jobs} processi...")
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futures = {executor.submit(_process_file, p, terms): p
+                           for p in tex_paths}
+                for future in as_completed(futures):
+                    tex_path = futures[future]
+                    modifiche = future.result()
+                    totale += modifiche
+                    print(f"✅ {tex_path.name}: {modifiche} nuovi marcatori")
         else:
-            print("\n✅ Nessuna modifica necessaria (tutti i termini sono già marcati)")
-        
+            # Le letture sono indipendenti: lanciate in parallelo su due
+            # thread, l'attesa su disco dell'una copre quella delle altre
+            print("📖 Lettura file e caricamento glossario...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                f_terms = executor.submit(load_glossary_terms, glossary_path)
+                f_texts = [executor.submit(p.read_text, encoding="utf-8")
+                           for p in tex_paths]
+                terms = f_terms.result()
+                tex_texts = [f.result() for f in f_texts]
+            print(f"✅ Caricati {len(terms)} termini dal glossario")
+
+            for tex_path, tex_text in zip(tex_paths, tex_texts):
+                print(f"\n🔄 Elaborazione di {tex_path.name}...")
+                # Il numero di modifiche arriva direttamente da add_G_suffix:
+                # niente doppio count('\G{}') sull'intero testo prima e dopo
+                updated, modifiche = add_G_suffix(tex_text, terms)
+
+                if modifiche > 0:
+                    # Salva il file
+                    tex_path.write_text(updated, encoding="utf-8")
+                    print(f"✅ File modificato: {modifiche} nuovi marcatori")
+                    totale += modifiche
+                else:
+                    print("✅ Nessuna modifica necessaria (tutti i termini sono già marcati)")
+
+        print(f"\n📊 Totale nuovi marcatori: {totale}")
         print("=" * 60)
-        
+
     except Exception as e:
         print(f"\n❌ Errore durante l'elaborazione: {e}")
         import traceback
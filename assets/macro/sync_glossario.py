@@ -11,6 +11,13 @@ BASE = Path("E:/TERZO ANNO/PRIMO TRIMESTRE/INGERNERIA DEL SOFTWARE/PROGETTO")
 LATEX = BASE / "RTB" / "GLOSSARIO" / "Glossario.tex"
 JSON = BASE / "SITO" / "glossario.json"
 
+# Pattern compilati una volta all'import
+_SUBSEC_START_RE = re.compile(r'\\subsection\{')
+_SUBSEC_RE = re.compile(r'\\subsection\{([^}]+)\}(.*)', re.DOTALL)
+_STOP_RE = re.compile(r'\\newpage|\\section\{')
+_WS_RE = re.compile(r'\s+')
+_CMD_RE = re.compile(r'\\[a-zA-Z]+\{.*?\}')
+
 def main():
     print("="*50)
     print("SINCRONIZZAZIONE GLOSSARIO")
@@ -25,12 +32,25 @@ def main():
     with open(LATEX, 'r', encoding='utf-8') as f:
         tex = f.read()
     
-    # Estrai termini da LaTeX
+    # Estrai termini da LaTeX: una passata di finditer individua gli
+    # inizi delle \subsection e ogni sezione è la fetta tra due inizi
+    # consecutivi. La vecchia findall con ".*?" + lookahead sotto DOTALL
+    # riesplorava il resto del file a ogni sezione; qui ogni carattere
+    # viene toccato una volta sola e non si materializza la lista di tuple
     tex_termini = {}
-    matches = re.findall(r'\\subsection\{([^}]+)\}(.*?)(?=\\subsection|\\newpage|\\section|$)', tex, re.DOTALL)
-    for nome, defn in matches:
-        defn = re.sub(r'\s+', ' ', defn.strip())
-        defn = re.sub(r'\\[a-zA-Z]+\{.*?\}', '', defn)
+    starts = [m.start() for m in _SUBSEC_START_RE.finditer(tex)]
+    starts.append(len(tex))
+    for i in range(len(starts) - 1):
+        match = _SUBSEC_RE.match(tex, starts[i], starts[i + 1])
+        if not match:
+            continue
+        nome, defn = match.groups()
+        # La definizione termina al primo \newpage o \section{ della fetta
+        stop = _STOP_RE.search(defn)
+        if stop:
+            defn = defn[:stop.start()]
+        defn = _WS_RE.sub(' ', defn.strip())
+        defn = _CMD_RE.sub('', defn)
         tex_termini[nome.strip()] = defn
     
     print(f"   ✅ Termini nel LaTeX: {len(tex_termini)}")
@@ -47,15 +67,18 @@ def main():
     else:
         print("   ⚠️  File JSON non trovato (sarà creato)")
     
-    # Confronta
-    aggiungere = [t for t in tex_termini if t not in json_termini]
-    rimuovere = [t for t in json_termini if t not in tex_termini]
-    modificare = []
-    
-    for t in tex_termini:
-        if t in json_termini:
-            if tex_termini[t].lower() != json_termini[t].lower():
-                modificare.append(t)
+    # Confronta: differenze e intersezione calcolate con le operazioni
+    # insiemistiche delle viste dict.keys() (implementate in C) invece
+    # dei list comprehension con "not in" per elemento; casefold() (il
+    # lower "aggressivo" Unicode) è calcolato una volta per definizione
+    tex_keys = tex_termini.keys()
+    json_keys = json_termini.keys()
+    aggiungere = sorted(tex_keys - json_keys)
+    rimuovere = sorted(json_keys - tex_keys)
+    tex_folded = {t: d.casefold() for t, d in tex_termini.items()}
+    json_folded = {t: d.casefold() for t, d in json_termini.items()}
+    modificare = sorted(t for t in tex_keys & json_keys
+                        if tex_folded[t] != json_folded[t])
     
     # Statistiche
     print("\n" + "="*50)